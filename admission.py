@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from instrumentation import configure_logging, logger
+from parameters import *
+from simulation import SimulationConfig, build_scenario, make_placer, make_workflows
+from snapshot import load_scenario
+
+# 요청/응답은 한 줄에 하나의 JSON (JSONL)
+# 배치 요청: {"id": 요청 id, "processing": [태스크별 요구량], "bandwidth": [태스크별 요구량],
+#            "start_node": 시작 노드(생략 시 무작위), "duration": 자원을 점유하는 시간(초, 생략 시 release 요청까지)}
+# 해제 요청: {"op": "release", "id": 요청 id}, 통계 요청: {"op": "stats"}
+# 응답: {"id", "admitted", "path"} 또는 {"id", "released"} 또는 {"stats"}, 잘못된 요청은 {"id", "error"}
+
+
+def latency_summary(latencies):  # 지연 시간(초) 목록의 백분위수 (밀리초)
+    if not len(latencies):
+        return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    p50, p90, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 90, 99])
+    return {"p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99),
+            "max_ms": float(np.max(latencies)) * 1000.0}
+
+
+class AdmissionStats:
+
+    def __init__(self):
+        self.received = 0
+        self.admitted = 0
+        self.rejected = 0  # 자원 부족으로 배치하지 못한 요청 수
+        self.invalid = 0  # 형식이 잘못된 요청 수
+        self.errors = 0  # 처리 중 예상하지 못한 예외가 발생한 요청 수
+        self.released = 0
+        self.batches = 0
+        self.latencies = []  # 요청을 받은 시점부터 응답까지의 시간(초)
+        self.started = time.perf_counter()
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        stats = {"received": self.received, "admitted": self.admitted, "rejected": self.rejected,
+                 "invalid": self.invalid, "errors": self.errors, "released": self.released, "batches": self.batches,
+                 "mean_batch_size": self.received / self.batches if self.batches else 0.0,
+                 "elapsed": elapsed, "throughput": self.received / elapsed if elapsed > 0 else 0.0}
+        stats.update(latency_summary(self.latencies))
+        return stats
+
+
+class AdmissionController:
+    # 노드별 남은 자원을 메모리에 유지하며 도착한 워크플로우를 배치(admit)하거나 거절하고, 끝난 워크플로우의 자원을 반환
+
+    def __init__(self, scenario, placer, seed=None):
+        self.topology = scenario.topology
+        self.placer = placer
+        self.processing_capacity = np.asarray(scenario.processing_capacity, dtype=np.int64)
+        self.bandwidth_capacity = np.asarray(scenario.bandwidth_capacity, dtype=np.int64)
+        self.processing = self.processing_capacity.copy()
+        self.bandwidth = self.bandwidth_capacity.copy()
+        self.active = {}  # 요청 id -> (경로, 프로세싱 요구량, 대역폭 요구량)
+        self.rng = np.random.default_rng(seed)
+
+    def admit(self, request_id, required_processing, required_bandwidth, start_node=None):
+        if request_id in self.active:
+            raise ValueError("duplicate request id: %r" % (request_id,))
+        if start_node is None:
+            start_node = int(self.rng.integers(1, self.topology.max_index + 1))
+        elif not 1 <= start_node <= self.topology.max_index:
+            raise ValueError("start_node must be between 1 and %d" % self.topology.max_index)
+        path = self.placer.place(self.processing, self.bandwidth, required_processing, required_bandwidth,
+                                 start_node, self.rng)
+        if path is None:
+            return None
+        self.processing[path] -= required_processing
+        self.bandwidth[path] -= required_bandwidth
+        self.active[request_id] = (path, required_processing, required_bandwidth)
+        return path
+
+    def release(self, request_id):
+        entry = self.active.pop(request_id, None)
+        if entry is None:
+            return False
+        path, required_processing, required_bandwidth = entry
+        self.processing[path] += required_processing
+        self.bandwidth[path] += required_bandwidth
+        return True
+
+    def utilization(self):
+        return {"active": len(self.active),
+                "processing_utilization": 1.0 - self.processing.sum() / float(self.processing_capacity.sum()),
+                "bandwidth_utilization": 1.0 - self.bandwidth.sum() / float(self.bandwidth_capacity.sum())}
+
+
+_MAX_DEMAND = np.iinfo(np.int64).max
+
+
+def _is_integer(value):  # JSON 정수만 허용 (bool, 실수는 허용하지 않음)
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _demands(message, name):  # 태스크별 요구량은 1 이상 int64 범위의 정수 리스트
+    values = message[name]
+    if not isinstance(values, list) or not all(_is_integer(value) and 0 < value <= _MAX_DEMAND for value in values):
+        raise ValueError("%s must be a list of positive integers" % name)
+    return np.array(values, dtype=np.int64)
+
+
+def parse_request(message):
+    # 배치 요청을 (id, 프로세싱 요구량 배열, 대역폭 요구량 배열, 시작 노드, 점유 시간) 으로 변환
+    required_processing = _demands(message, "processing")
+    required_bandwidth = _demands(message, "bandwidth")
+    if len(required_processing) != len(required_bandwidth):
+        raise ValueError("processing and bandwidth must be lists of the same length")
+    if not len(required_processing):
+        raise ValueError("workflow has no tasks")
+    start_node = message.get("start_node")
+    if start_node is not None and not _is_integer(start_node):
+        raise ValueError("start_node must be an integer")
+    duration = message.get("duration")
+    if duration is not None and (not isinstance(duration, (int, float)) or isinstance(duration, bool)
+                                 or not 0 <= duration < float("inf")):
+        raise ValueError("duration must be a non-negative number of seconds")
+    return message["id"], required_processing, required_bandwidth, start_node, duration
+
+
+class AdmissionService:
+    # 요청을 큐에 모았다가 micro-batch 단위로 처리
+    # 첫 요청이 도착하면 batch_delay 초 동안 더 기다린 뒤 최대 batch_size 개를 도착 순서대로 한 번에 처리
+    # (요청마다 이벤트 루프로 돌아가지 않으므로 요청이 몰릴 때 처리량이 높아짐)
+
+    def __init__(self, controller, batch_size=AdmissionBatchSize, batch_delay=AdmissionBatchDelay):
+        self.controller = controller
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.stats = AdmissionStats()
+        self.queue = None
+        self.batcher = None
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.ensure_future(self._run_batches())
+
+    async def close(self):
+        await self.queue.join()
+        self.batcher.cancel()
+        try:
+            await self.batcher
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, message, respond):
+        # respond: 응답 dict 를 받는 함수
+        self.stats.received += 1
+        await self.queue.put((time.perf_counter(), message, respond))
+
+    async def handle_stream(self, reader, respond):
+        # reader 에서 JSONL 요청을 읽어 큐에 넣고, EOF 이면 그때까지 받은 요청의 처리가 끝날 때까지 기다림
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as error:
+                self.stats.invalid += 1
+                respond({"id": None, "error": str(error)})
+                continue
+            await self.submit(message, respond)
+        await self.queue.join()
+
+    async def _run_batches(self):
+        while True:
+            batch = [await self.queue.get()]
+            if self.batch_delay > 0 and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                self._process(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _process(self, batch):
+        # 요청 하나의 예외가 batch 처리 task 를 종료시키지 않도록 요청마다 예외를 응답으로 변환
+        self.stats.batches += 1
+        for arrived, message, respond in batch:
+            try:
+                response = self._handle(message)
+            except (KeyError, TypeError, ValueError) as error:
+                self.stats.invalid += 1
+                response = {"id": message.get("id"), "error": str(error)}
+            except Exception as error:
+                logger.exception("Failed to handle request %r", message.get("id"))
+                self.stats.errors += 1
+                response = {"id": message.get("id"), "error": "internal error: %s" % error}
+            self.stats.latencies.append(time.perf_counter() - arrived)
+            try:
+                respond(response)
+            except Exception:  # 연결이 끊긴 경우 등
+                logger.exception("Failed to send response for request %r", message.get("id"))
+
+    def _handle(self, message):
+        op = message.get("op", "admit")
+        if op == "release":
+            released = self.controller.release(message["id"])
+            self.stats.released += released
+            return {"id": message["id"], "released": released}
+        if op == "stats":
+            stats = self.stats.as_dict()
+            stats.update(self.controller.utilization())
+            return {"stats": stats}
+        if op != "admit":
+            raise ValueError("unknown op: %r" % (op,))
+        request_id, required_processing, required_bandwidth, start_node, duration = parse_request(message)
+        path = self.controller.admit(request_id, required_processing, required_bandwidth, start_node)
+        if path is None:
+            self.stats.rejected += 1
+            return {"id": request_id, "admitted": False}
+        self.stats.admitted += 1
+        if duration is not None:  # 점유 시간이 지나면 자원을 반환
+            asyncio.get_running_loop().call_later(float(duration), self._expire, request_id)
+        return {"id": request_id, "admitted": True, "path": [int(node) for node in path]}
+
+    def _expire(self, request_id):
+        self.stats.released += self.controller.release(request_id)
+
+
+def make_service(config, scenario=None, seed=None, batch_size=AdmissionBatchSize, batch_delay=AdmissionBatchDelay):
+    if scenario is None:
+        scenario = build_scenario(config, seed)
+    placer = make_placer(config, scenario.topology, scenario.routing)
+    return AdmissionService(AdmissionController(scenario, placer, seed), batch_size, batch_delay)
+
+
+def _write_line(stream, response):
+    stream.write(json.dumps(response) + "\n")
+
+
+async def _stdin_reader():
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    return reader
+
+
+async def serve_stdin(service):
+    # 표준 입력의 JSONL 요청을 처리하여 표준 출력으로 응답. EOF 이면 통계를 반환
+    await service.start()
+    await service.handle_stream(await _stdin_reader(), lambda response: _write_line(sys.stdout, response))
+    await service.close()
+    sys.stdout.flush()
+    return service.stats.as_dict()
+
+
+async def serve_socket(service, socket_path=None, port=None):
+    # 로컬 소켓(unix 소켓 경로 또는 127.0.0.1 의 TCP 포트)에서 연결마다 JSONL 요청을 처리
+    await service.start()
+
+    async def handle_connection(reader, writer):
+        await service.handle_stream(reader, lambda response: _write_line_to(writer, response))
+        await writer.drain()
+        writer.close()
+
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(handle_connection, socket_path)
+    else:
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", port)
+    logger.info("Admission service listening on %s", socket_path if socket_path is not None else port)
+    async with server:
+        await server.serve_forever()
+
+
+def _write_line_to(writer, response):
+    writer.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+def generate_requests(config, count, rate=LoadGeneratorRate, hold_time=LoadGeneratorHoldTime, seed=None):
+    # (보낼 시각(초), 요청) 을 생성. 도착 간격은 평균 1 / rate 의 지수 분포 (rate 가 0 이면 모두 0초),
+    # 점유 시간은 평균 hold_time 의 지수 분포, 태스크 요구량은 config 의 워크플로우 파라미터를 따름
+    rng = np.random.default_rng(seed)
+    table = make_workflows(config.replace(num_of_workflows=count), rng)
+    send_times = np.cumsum(rng.exponential(1.0 / rate, count)) if rate > 0 else np.zeros(count)
+    durations = rng.exponential(hold_time, count)
+    for index in range(count):
+        required_processing, required_bandwidth = table.workflow(index)
+        yield float(send_times[index]), {"id": index, "processing": required_processing.tolist(),
+                                         "bandwidth": required_bandwidth.tolist(),
+                                         "duration": float(durations[index])}
+
+
+async def _paced(requests):
+    started = time.perf_counter()
+    for send_time, message in requests:
+        delay = send_time - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield message
+
+
+async def generate_load(requests, socket_path=None, port=None):
+    # 서비스에 연결하여 요청을 보내고, 클라이언트 기준 응답 지연 시간과 처리량을 반환
+    if socket_path is not None:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    else:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    sent = {}
+    latencies = []
+    admitted = 0
+    started = time.perf_counter()
+
+    async def send():
+        async for message in _paced(requests):
+            sent[message["id"]] = time.perf_counter()
+            _write_line_to(writer, message)
+            await writer.drain()
+        writer.write_eof()
+
+    sender = asyncio.ensure_future(send())
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        response = json.loads(line)
+        if response.get("id") in sent:
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            admitted += bool(response.get("admitted"))
+    await sender
+    writer.close()
+    elapsed = time.perf_counter() - started
+    summary = {"responses": len(latencies), "admitted": admitted, "elapsed": elapsed,
+               "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0}
+    summary.update(latency_summary(latencies))
+    return summary
+
+
+async def write_load(requests, stream):  # 요청을 보낼 시각에 맞추어 stream 에 JSONL 로 출력 (serve --stdin 에 파이프로 연결)
+    async for message in _paced(requests):
+        _write_line(stream, message)
+        stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Online workflow admission service")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="로그 출력 (-v: INFO, -vv: DEBUG)")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    serve = commands.add_parser("serve", help="요청을 받아 배치/해제")
+    serve.add_argument("--seed", type=int, default=RandomSeed, help="시나리오 생성 및 시작 노드 선택 난수 시드")
+    serve.add_argument("--drones", type=int, dest="num_of_drones", help="UAV의 수")
+    serve.add_argument("--load-scenario", help="시나리오를 생성하지 않고 불러올 스냅샷 파일 경로")
+    serve.add_argument("--socket", help="unix 소켓 경로 (생략하면 표준 입력)")
+    serve.add_argument("--port", type=int, help="127.0.0.1 의 TCP 포트 (생략하면 표준 입력)")
+    serve.add_argument("--batch-size", type=int, default=AdmissionBatchSize, help="micro-batch 의 최대 요청 수")
+    serve.add_argument("--batch-delay", type=float, default=AdmissionBatchDelay, help="micro-batch 를 모으는 시간(초)")
+    load = commands.add_parser("loadgen", help="부하 생성기")
+    load.add_argument("--count", type=int, default=1000, help="보낼 요청 수")
+    load.add_argument("--rate", type=float, default=LoadGeneratorRate, help="초당 요청 수 (0: 최대한 빠르게)")
+    load.add_argument("--hold-time", type=float, default=LoadGeneratorHoldTime, help="평균 점유 시간(초)")
+    load.add_argument("--seed", type=int, default=RandomSeed, help="요청 생성 난수 시드")
+    load.add_argument("--socket", help="접속할 unix 소켓 경로 (생략하면 표준 출력으로 요청을 출력)")
+    load.add_argument("--port", type=int, help="접속할 127.0.0.1 의 TCP 포트 (생략하면 표준 출력으로 요청을 출력)")
+    arguments = parser.parse_args(argv)
+    configure_logging(arguments.verbose)
+
+    if arguments.command == "serve":
+        scenario = None
+        config = SimulationConfig()
+        if arguments.load_scenario is not None:
+            if arguments.num_of_drones is not None:  # 시나리오를 결정하는 값은 스냅샷과 맞지 않게 되므로 변경할 수 없음
+                raise SystemExit("error: cannot override num_of_drones when loading a scenario")
+            scenario = load_scenario(arguments.load_scenario)
+            config = scenario.config
+        elif arguments.num_of_drones is not None:
+            config = config.replace(num_of_drones=arguments.num_of_drones)
+        service = make_service(config, scenario, arguments.seed, arguments.batch_size, arguments.batch_delay)
+        if arguments.socket is None and arguments.port is None:
+            stats = asyncio.run(serve_stdin(service))
+            stats.update(service.controller.utilization())
+            print(json.dumps(stats), file=sys.stderr)
+        else:
+            try:
+                asyncio.run(serve_socket(service, arguments.socket, arguments.port))
+            except KeyboardInterrupt:
+                print(json.dumps(service.stats.as_dict()), file=sys.stderr)
+    else:
+        requests = generate_requests(SimulationConfig(), arguments.count, arguments.rate, arguments.hold_time,
+                                     arguments.seed)
+        if arguments.socket is None and arguments.port is None:
+            asyncio.run(write_load(requests, sys.stdout))
+        else:
+            summary = asyncio.run(generate_load(requests, arguments.socket, arguments.port))
+            print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
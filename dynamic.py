@@ -0,0 +1,291 @@
+import numpy as np
+
+from genetic import as_seed_sequence
+from parameters import *
+from path_cache import PathCache
+from placement import PlacementEngine
+
+
+class RandomWalkMobility:
+    # 매 tick 마다 각 드론이 move_probability 확률로 최대 max_step 만큼 임의의 방향으로 이동 (모니터링 영역 안으로 제한)
+
+    def __init__(self, area, max_step=MobilityMaxStep, move_probability=MobilityMoveProbability):
+        self.area = area
+        self.max_step = max_step
+        self.move_probability = move_probability
+
+    def step(self, x_positions, y_positions, num_drones, rng):
+        # 이동한 드론 번호 배열과 새 좌표를 반환 (좌표 배열은 변경하지 않음)
+        moved = np.nonzero(rng.random(num_drones) < self.move_probability)[0] + 1
+        new_x = np.clip(x_positions[moved] + rng.uniform(-self.max_step, self.max_step, len(moved)), 1, self.area)
+        new_y = np.clip(y_positions[moved] + rng.uniform(-self.max_step, self.max_step, len(moved)), 1, self.area)
+        return moved, new_x, new_y
+
+
+class DynamicTopology:
+    # 드론 이동에 따라 연결 정보를 부분적으로 갱신하는 토폴로지
+    # 드론은 그리드(셀 크기 = 통신 반경)에 등록되어 있어, 이동한 드론 주변 셀만 검사하여 링크를 다시 계산
+    # PlacementEngine 이 사용하는 neighbors(), num_nodes, max_index 를 제공
+
+    def __init__(self, topology, trans_range):
+        self.x_positions = topology.x_positions.astype(np.float64)
+        self.y_positions = topology.y_positions.astype(np.float64)
+        self.num_drones = topology.num_drones
+        self.num_edge_servers = topology.num_edge_servers
+        self.num_cloud_servers = topology.num_cloud_servers
+        self.max_index = topology.max_index
+        self.trans_range = float(trans_range)
+        self.cell_size = self.trans_range if self.trans_range > 0 else 1.0
+        self.adjacency = [set(topology.neighbors(node).tolist()) for node in range(topology.num_nodes)]
+        self._neighbor_cache = {}
+        self.cells = {}
+        self.cell_of = {}
+        for drone in range(1, self.num_drones + 1):
+            self._add_to_cell(drone)
+
+    @property
+    def num_nodes(self):
+        return self.max_index + 1
+
+    def neighbors(self, node):
+        neighbors = self._neighbor_cache.get(node)
+        if neighbors is None:
+            neighbors = np.array(sorted(self.adjacency[node]), dtype=np.int64)
+            self._neighbor_cache[node] = neighbors
+        return neighbors
+
+    def has_link(self, node1, node2):
+        return node2 in self.adjacency[node1]
+
+    def _cell(self, drone):
+        return (int(self.x_positions[drone] // self.cell_size), int(self.y_positions[drone] // self.cell_size))
+
+    def _add_to_cell(self, drone):
+        cell = self._cell(drone)
+        self.cells.setdefault(cell, set()).add(drone)
+        self.cell_of[drone] = cell
+
+    def _remove_from_cell(self, drone):
+        cell = self.cell_of.pop(drone)
+        members = self.cells[cell]
+        members.discard(drone)
+        if not members:
+            del self.cells[cell]
+
+    def _drones_in_range(self, drone):
+        cx, cy = self.cell_of[drone]
+        candidates = [member for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                      for member in self.cells.get((cx + dx, cy + dy), ())]
+        candidates = np.array(candidates, dtype=np.int64)
+        diff_x = self.x_positions[candidates] - self.x_positions[drone]
+        diff_y = self.y_positions[candidates] - self.y_positions[drone]
+        within = (diff_x * diff_x + diff_y * diff_y <= self.trans_range ** 2) & (candidates != drone)
+        return set(candidates[within].tolist())
+
+    def move(self, drones, new_x, new_y):
+        # drones 를 새 좌표로 옮기고 (끊어진 링크 집합, 새로 생긴 링크 집합)을 반환 (링크는 (작은 번호, 큰 번호))
+        for drone, pos_x, pos_y in zip(drones.tolist(), new_x, new_y):
+            self._remove_from_cell(drone)
+            self.x_positions[drone] = pos_x
+            self.y_positions[drone] = pos_y
+            self._add_to_cell(drone)
+
+        removed = set()
+        added = set()
+        for drone in drones.tolist():
+            old_neighbors = {node for node in self.adjacency[drone] if node <= self.num_drones}
+            new_neighbors = self._drones_in_range(drone)
+            for node in old_neighbors - new_neighbors:
+                removed.add((min(drone, node), max(drone, node)))
+            for node in new_neighbors - old_neighbors:
+                added.add((min(drone, node), max(drone, node)))
+
+        for node1, node2 in removed:
+            self.adjacency[node1].discard(node2)
+            self.adjacency[node2].discard(node1)
+            self._neighbor_cache.pop(node1, None)
+            self._neighbor_cache.pop(node2, None)
+        for node1, node2 in added:
+            self.adjacency[node1].add(node2)
+            self.adjacency[node2].add(node1)
+            self._neighbor_cache.pop(node1, None)
+            self._neighbor_cache.pop(node2, None)
+        return removed, added
+
+
+class TickStats:
+
+    def __init__(self, tick, moved, links_removed, links_added, replaced, failed, deployed):
+        self.tick = tick
+        self.moved = moved  # 이동한 드론 수
+        self.links_removed = links_removed
+        self.links_added = links_added
+        self.replaced = replaced  # 다시 배치에 성공한 워크플로우 수
+        self.failed = failed  # 다시 배치에 실패하여 대기 중인 워크플로우 수
+        self.deployed = deployed  # 현재 배치된 워크플로우 수
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class DynamicAllocation:
+    # 배치된 워크플로우의 경로와 노드별 남은 자원을 관리
+    # 링크 -> 워크플로우, 노드 -> 워크플로우 인덱스로 영향을 받은 워크플로우만 찾아 다시 배치
+
+    def __init__(self, topology, table, processing_capacity, bandwidth_capacity,
+                 max_expansions=PlacementExpansionBudget, path_cache_size=PathCacheSize,
+                 path_cache_candidates=PathCacheCandidates):
+        self.topology = topology
+        self.table = table
+        self.engine = PlacementEngine(topology, max_expansions)
+        if path_cache_size > 0:  # 링크가 바뀔 때마다 해당 노드를 지나는 후보만 무효화
+            self.engine = PathCache(self.engine, path_cache_size, path_cache_candidates, max_expansions)
+        self.processing_capacity = np.asarray(processing_capacity, dtype=np.int64).copy()
+        self.bandwidth_capacity = np.asarray(bandwidth_capacity, dtype=np.int64).copy()
+        self.processing = self.processing_capacity.copy()
+        self.bandwidth = self.bandwidth_capacity.copy()
+        self.paths = {}  # 워크플로우 번호(0부터) -> 배치된 노드 리스트 (visited_node_info)
+        self.start_nodes = {}  # 워크플로우 번호 -> 시작 노드
+        self.pending = set()  # 배치에 실패하여 다시 시도할 워크플로우
+        self.workflows_on_link = {}
+        self.workflows_on_node = {}
+
+    def reserve(self, workflow, path):
+        required_processing, required_bandwidth = self.table.workflow(workflow)
+        self.processing[path] -= required_processing
+        self.bandwidth[path] -= required_bandwidth
+        self.paths[workflow] = path
+        self.pending.discard(workflow)
+        for node in path:
+            self.workflows_on_node.setdefault(node, set()).add(workflow)
+        for node1, node2 in zip(path[:-1], path[1:]):
+            self.workflows_on_link.setdefault((min(node1, node2), max(node1, node2)), set()).add(workflow)
+
+    def release(self, workflow):
+        path = self.paths.pop(workflow, None)
+        if path is None:
+            return
+        required_processing, required_bandwidth = self.table.workflow(workflow)
+        self.processing[path] += required_processing
+        self.bandwidth[path] += required_bandwidth
+        for node in path:
+            self.workflows_on_node[node].discard(workflow)
+        for node1, node2 in zip(path[:-1], path[1:]):
+            link = (min(node1, node2), max(node1, node2))
+            workflows = self.workflows_on_link[link]
+            workflows.discard(workflow)
+            if not workflows:
+                del self.workflows_on_link[link]
+
+    def place(self, workflow, start_node, rng=None):
+        self.start_nodes[workflow] = start_node
+        required_processing, required_bandwidth = self.table.workflow(workflow)
+        path = self.engine.place(self.processing, self.bandwidth, required_processing, required_bandwidth,
+                                 start_node, rng)
+        if path is None:
+            self.pending.add(workflow)
+            return False
+        self.reserve(workflow, path)
+        return True
+
+    def set_capacity(self, nodes, processing_capacity, bandwidth_capacity):
+        # 노드의 자원 용량을 변경 (남은 자원도 같은 양만큼 변경). 자원이 부족해진 노드의 워크플로우를 반환
+        nodes = np.asarray(nodes)
+        self.processing[nodes] += np.asarray(processing_capacity) - self.processing_capacity[nodes]
+        self.bandwidth[nodes] += np.asarray(bandwidth_capacity) - self.bandwidth_capacity[nodes]
+        self.processing_capacity[nodes] = processing_capacity
+        self.bandwidth_capacity[nodes] = bandwidth_capacity
+        return self.overloaded_workflows(nodes)
+
+    def overloaded_workflows(self, nodes):
+        affected = set()
+        for node in np.asarray(nodes).tolist():
+            if self.processing[node] <= 0 or self.bandwidth[node] <= 0:
+                affected.update(self.workflows_on_node.get(node, ()))
+        return affected
+
+    def affected_by_links(self, removed_links):
+        affected = set()
+        for link in removed_links:
+            affected.update(self.workflows_on_link.get(link, ()))
+        return affected
+
+    def replace(self, workflows, rng=None):
+        # 영향을 받은 워크플로우의 자원을 먼저 모두 반환한 뒤 원래 시작 노드에서 다시 배치
+        workflows = sorted(workflows)
+        for workflow in workflows:
+            self.release(workflow)
+        return sum(self.place(workflow, self.start_nodes[workflow], rng) for workflow in workflows)
+
+
+class DynamicSimulation:
+    # 시간 단계(tick)별로 드론을 이동시키고, 바뀐 링크/자원에 영향을 받은 워크플로우만 다시 배치
+
+    def __init__(self, scenario, mobility, paths=None, seed=None, max_expansions=PlacementExpansionBudget,
+                 pending_retries_per_tick=PendingRetriesPerTick, path_cache_size=PathCacheSize,
+                 path_cache_candidates=PathCacheCandidates):
+        # paths: {워크플로우 번호(0부터): 배치된 노드 리스트} (예: 유전 알고리즘 최고 개체의 배치)
+        self.pending_retries_per_tick = pending_retries_per_tick
+        self.rng = np.random.default_rng(as_seed_sequence(seed))
+        self.scenario = scenario
+        self.mobility = mobility
+        self.topology = DynamicTopology(scenario.topology, scenario.config.trans_range_of_drone)
+        self.allocation = DynamicAllocation(self.topology, scenario.workflow_table, scenario.processing_capacity,
+                                            scenario.bandwidth_capacity, max_expansions, path_cache_size,
+                                            path_cache_candidates)
+        self.tick_count = 0
+        self.history = []
+        for workflow in range(scenario.workflow_table.num_workflows):
+            if paths is not None and workflow in paths:
+                self.allocation.start_nodes[workflow] = paths[workflow][0]
+                self.allocation.reserve(workflow, list(paths[workflow]))
+            else:
+                self.allocation.place(workflow, int(self.rng.integers(1, self.topology.max_index + 1)), self.rng)
+
+    @classmethod
+    def from_result(cls, result, mobility=None, seed=None):
+        # 동적 모드는 직접 연결된 링크 단위로 경로를 관리하므로 다중 hop 배치 결과는 사용할 수 없음
+        if result.config.max_hops_between_tasks > 1:
+            raise ValueError("dynamic mode requires max_hops_between_tasks == 1 (got %d)"
+                             % result.config.max_hops_between_tasks)
+        table = result.scenario.workflow_table
+        placements = result.population.placements[result.best_index]
+        deployed = result.population.deployed[result.best_index]
+        paths = {workflow: placements[workflow, :table.num_tasks[workflow]].tolist()
+                 for workflow in range(table.num_workflows) if deployed[workflow]}
+        if mobility is None:
+            config = result.config
+            mobility = RandomWalkMobility(config.size_of_monitoring_area, config.mobility_max_step,
+                                          config.mobility_move_probability)
+        return cls(result.scenario, mobility, paths, seed, result.config.placement_expansion_budget,
+                   result.config.pending_retries_per_tick, result.config.path_cache_size,
+                   result.config.path_cache_candidates)
+
+    def tick(self, capacity_changes=None):
+        # capacity_changes: (노드 배열, 프로세싱 용량 배열, 대역폭 용량 배열) 또는 None
+        moved, new_x, new_y = self.mobility.step(self.topology.x_positions, self.topology.y_positions,
+                                                 self.topology.num_drones, self.rng)
+        removed, added = self.topology.move(moved, new_x, new_y)
+        if isinstance(self.allocation.engine, PathCache):
+            self.allocation.engine.invalidate_links(removed | added)
+        affected = self.allocation.affected_by_links(removed)
+        if capacity_changes is not None:
+            affected |= self.allocation.set_capacity(*capacity_changes)
+        retry = set()
+        if added and self.allocation.pending:  # 새 링크가 생기면 대기 중인 워크플로우 일부를 다시 시도
+            candidates = sorted(self.allocation.pending - affected)
+            if candidates:
+                num_of_retry = min(len(candidates), self.pending_retries_per_tick)
+                retry = set(self.rng.choice(candidates, num_of_retry, replace=False).tolist())
+        replaced = self.allocation.replace(affected | retry, self.rng)
+
+        self.tick_count += 1
+        stats = TickStats(self.tick_count, len(moved), len(removed), len(added), replaced,
+                          len(self.allocation.pending), len(self.allocation.paths))
+        self.history.append(stats)
+        return stats
+
+    def run(self, num_of_ticks=NumOfTicks):
+        for _ in range(num_of_ticks):
+            self.tick()
+        return self.history
@@ -0,0 +1,57 @@
+import numpy as np
+
+from parameters import *
+
+
+class FitnessEvaluator:
+    # population 전체의 성능(배치된 워크플로우 수, 할당된 프로세싱 파워/대역폭, 딜레이 factor 합,
+    # 태스크 간 전송 지연 합)을 한 번의 배열 연산으로 계산
+    # latency 는 routing.RoutingTable.latency 와 같은 (노드 수, 노드 수) 전송 지연 테이블 (None 이면 전송 지연 0)
+
+    def __init__(self, table, delay_factor_values,
+                 weight_of_deployed=FitnessWeightOfDeployed, weight_of_processing=FitnessWeightOfProcessing,
+                 weight_of_bandwidth=FitnessWeightOfBandwidth, weight_of_delay=FitnessWeightOfDelay,
+                 weight_of_latency=FitnessWeightOfLatency, latency=None):
+        self.table = table
+        self.delay_factor = np.asarray(delay_factor_values, dtype=np.float64)
+        self.processing_total = table.processing.sum(axis=1).astype(np.float64)  # 워크플로우별 총 프로세싱 요구량
+        self.bandwidth_total = table.bandwidth.sum(axis=1).astype(np.float64)  # 워크플로우별 총 대역폭 요구량
+        self.weight_of_deployed = weight_of_deployed
+        self.weight_of_processing = weight_of_processing
+        self.weight_of_bandwidth = weight_of_bandwidth
+        self.weight_of_delay = weight_of_delay
+        self.weight_of_latency = weight_of_latency
+        self.latency = latency
+        self.transfer_mask = table.task_mask[:, 1:]  # 다음 태스크로 데이터를 전송하는 태스크 위치
+
+    def components(self, placements, deployed):
+        # 반환: {"deployed", "processing", "bandwidth", "delay", "latency"} -> (개체 수,) 배열
+        deployed_weight = deployed.astype(np.float64)
+        active = deployed[:, :, None] & self.table.task_mask[None, :, :]
+        delay = np.where(active, self.delay_factor[placements], 0.0).sum(axis=(1, 2))
+        return {
+            "deployed": deployed_weight.sum(axis=1),
+            "processing": deployed_weight @ self.processing_total,
+            "bandwidth": deployed_weight @ self.bandwidth_total,
+            "delay": delay,
+            "latency": self.transfer_latency(placements, deployed),
+        }
+
+    def transfer_latency(self, placements, deployed):  # 배치된 워크플로우의 연속된 태스크 사이 전송 지연 합
+        if self.latency is None:
+            return np.zeros(len(placements))
+        active = deployed[:, :, None] & self.transfer_mask[None, :, :]
+        latency = self.latency[placements[:, :, :-1], placements[:, :, 1:]]
+        return np.where(active, latency, 0.0).sum(axis=(1, 2))
+
+    def combine(self, components):
+        return (self.weight_of_deployed * components["deployed"]
+                + self.weight_of_processing * components["processing"]
+                + self.weight_of_bandwidth * components["bandwidth"]
+                - self.weight_of_delay * components["delay"]
+                - self.weight_of_latency * components["latency"])
+
+    def evaluate(self, population):
+        return self.combine(self.components(population.placements, population.deployed))
+
+    __call__ = evaluate
@@ -0,0 +1,260 @@
+import time
+
+import numpy as np
+
+from chromosome import Chromosome
+from parameters import *
+
+
+class Population:
+    # 전체 population 을 배열로 저장
+    # placements[p, w, t]: p 번째 개체에서 w 번째 워크플로우의 t 번째 태스크가 배치된 노드 (0: 미배치)
+    # processing[p, n], bandwidth[p, n]: p 번째 개체에서 n 번 노드의 남은 자원
+
+    def __init__(self, placements, deployed, processing, bandwidth):
+        self.placements = placements
+        self.deployed = deployed
+        self.processing = processing
+        self.bandwidth = bandwidth
+        self.fitness = np.zeros(len(placements), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.placements)
+
+    def take(self, indices):
+        taken = Population(self.placements[indices], self.deployed[indices],
+                           self.processing[indices], self.bandwidth[indices])
+        taken.fitness = self.fitness[indices]
+        return taken
+
+
+class GAResult:
+
+    def __init__(self, population, best_index, history, generations, stop_reason, timings=None,
+                 initial_failed_workflows=None):
+        self.population = population
+        self.best_index = best_index
+        self.history = history  # 세대별 최고 fitness
+        self.generations = generations
+        self.stop_reason = stop_reason  # "generations", "converged", "time_budget"
+        self.timings = timings if timings is not None else {}  # population_init, fitness, evolution 실행 시간(초)
+        self.initial_failed_workflows = initial_failed_workflows  # 초기 population 의 개체별 배치 실패 워크플로우 수
+
+    @property
+    def best_fitness(self):
+        return float(self.population.fitness[self.best_index])
+
+
+def deployed_count_fitness(population):  # 기본 fitness: 배치된 워크플로우 수
+    return population.deployed.sum(axis=1).astype(np.float64)
+
+
+def empty_population(size, table, processing_capacity, bandwidth_capacity):
+    placements = np.zeros((size, table.num_workflows, table.max_tasks), dtype=np.int32)
+    deployed = np.zeros((size, table.num_workflows), dtype=bool)
+    processing = np.tile(np.asarray(processing_capacity, dtype=np.int64), (size, 1))
+    bandwidth = np.tile(np.asarray(bandwidth_capacity, dtype=np.int64), (size, 1))
+    return Population(placements, deployed, processing, bandwidth)
+
+
+def place_workflow_genes(population, index, workflows, engine, table, rng):
+    # index 번째 개체에 workflows 의 워크플로우들을 임의의 시작 노드에서 순서대로 배치
+    processing = population.processing[index]
+    bandwidth = population.bandwidth[index]
+    max_index = engine.topology.max_index
+    for workflow in workflows:
+        required_processing, required_bandwidth = table.workflow(workflow)
+        start_node = int(rng.integers(1, max_index + 1))
+        path = engine.place(processing, bandwidth, required_processing, required_bandwidth, start_node, rng)
+        if path is None:
+            continue
+        population.placements[index, workflow, :len(path)] = path
+        population.deployed[index, workflow] = True
+        processing[path] -= required_processing
+        bandwidth[path] -= required_bandwidth
+
+
+def as_seed_sequence(seed):
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def individual_seeds(seed, size):
+    # 개체마다 독립적인 RNG 시드를 사용하여 실행 방식(직렬/병렬)과 무관하게 같은 결과를 얻음
+    return as_seed_sequence(seed).spawn(size)
+
+
+def initialize_population(engine, table, processing_capacity, bandwidth_capacity, size, seed=None):
+    population = empty_population(size, table, processing_capacity, bandwidth_capacity)
+    workflows = range(table.num_workflows)
+    for index, individual_seed in enumerate(individual_seeds(seed, size)):
+        place_workflow_genes(population, index, workflows, engine, table, np.random.default_rng(individual_seed))
+    return population
+
+
+def resource_usage(placements, deployed, table, num_nodes):
+    # 개체별 노드 자원 사용량을 한 번에 계산 (반환: (개체 수, 노드 수) 배열 두 개)
+    size = len(placements)
+    active = deployed[:, :, None] & table.task_mask[None, :, :]
+    flat = (np.arange(size)[:, None, None] * num_nodes + placements)[active]
+    processing = np.broadcast_to(table.processing[None, :, :], placements.shape)[active]
+    bandwidth = np.broadcast_to(table.bandwidth[None, :, :], placements.shape)[active]
+    used_processing = np.bincount(flat, weights=processing, minlength=size * num_nodes)
+    used_bandwidth = np.bincount(flat, weights=bandwidth, minlength=size * num_nodes)
+    return (used_processing.reshape(size, num_nodes).astype(np.int64),
+            used_bandwidth.reshape(size, num_nodes).astype(np.int64))
+
+
+def tournament_select(fitness, num_of_select, tournament_size, rng):
+    candidates = rng.integers(0, len(fitness), size=(num_of_select, tournament_size))
+    winners = np.argmax(fitness[candidates], axis=1)
+    return candidates[np.arange(num_of_select), winners]
+
+
+def crossover(population, parents_a, parents_b, crossover_rate, processing_capacity, bandwidth_capacity, table,
+              rng):
+    # 워크플로우 단위 uniform crossover (자식은 각 워크플로우의 배치 경로를 두 부모 중 하나에서 물려받음)
+    num_of_child = len(parents_a)
+    from_a = rng.random((num_of_child, table.num_workflows)) < 0.5
+    from_a[rng.random(num_of_child) >= crossover_rate] = True
+    placements = np.where(from_a[:, :, None], population.placements[parents_a], population.placements[parents_b])
+    deployed = np.where(from_a, population.deployed[parents_a], population.deployed[parents_b])
+    used_processing, used_bandwidth = resource_usage(placements, deployed, table, len(processing_capacity))
+    children = Population(placements, deployed,
+                          np.asarray(processing_capacity, dtype=np.int64)[None, :] - used_processing,
+                          np.asarray(bandwidth_capacity, dtype=np.int64)[None, :] - used_bandwidth)
+    return children
+
+
+def release_workflows(population, released, table):
+    # released[p, w] 가 True 인 워크플로우의 자원을 반환하고 미배치 상태로 변경
+    released = released & population.deployed
+    if not released.any():
+        return
+    num_nodes = population.processing.shape[1]
+    used_processing, used_bandwidth = resource_usage(population.placements, released, table, num_nodes)
+    population.processing += used_processing
+    population.bandwidth += used_bandwidth
+    population.deployed[released] = False
+    population.placements[released] = 0
+
+
+def repair_capacity(population, table, rng):
+    # 자원이 부족해진(남은 자원 <= 0) 노드마다 그 노드를 사용하는 워크플로우 하나를 임의로 제거하는 과정을
+    # 제약을 만족하거나 부족한 노드를 사용하는 워크플로우가 없을 때까지 반복. 제거된 워크플로우는 (개체 수, 워크플로우 수) 마스크로 반환
+    dropped = np.zeros_like(population.deployed)
+    num_nodes = population.processing.shape[1]
+    while True:
+        violated = (population.processing <= 0) | (population.bandwidth <= 0)
+        violated[:, 0] = False
+        if not violated.any():
+            return dropped
+        active = population.deployed[:, :, None] & table.task_mask[None, :, :]
+        individual, workflow, task = np.nonzero(active & violated[np.arange(len(population))[:, None, None],
+                                                                 population.placements])
+        if not len(individual):  # 자원이 부족한 노드를 사용하는 워크플로우가 없으면 더 제거할 수 없음
+            return dropped
+        node_key = individual * num_nodes + population.placements[individual, workflow, task]
+        order = np.lexsort((rng.random(len(node_key)), node_key))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = node_key[order[1:]] != node_key[order[:-1]]
+        release = np.zeros_like(dropped)
+        release[individual[order[first]], workflow[order[first]]] = True
+        release_workflows(population, release, table)
+        dropped |= release
+
+
+def mutate(population, mutation_rate, engine, table, rng, pending=None):
+    # 일부 워크플로우를 해제한 뒤, 해제된 워크플로우와 pending 의 미배치 워크플로우를 새로운 시작 노드에서 다시 배치
+    mutated = rng.random(population.deployed.shape) < mutation_rate
+    release_workflows(population, mutated, table)
+    if pending is not None:
+        mutated |= pending
+    for index in np.nonzero(mutated.any(axis=1))[0]:
+        workflows = rng.permutation(np.nonzero(mutated[index] & ~population.deployed[index])[0])
+        place_workflow_genes(population, index, workflows, engine, table, rng)
+
+
+def concatenate_populations(first, second):
+    merged = Population(np.concatenate((first.placements, second.placements)),
+                        np.concatenate((first.deployed, second.deployed)),
+                        np.concatenate((first.processing, second.processing)),
+                        np.concatenate((first.bandwidth, second.bandwidth)))
+    merged.fitness = np.concatenate((first.fitness, second.fitness))
+    return merged
+
+
+def run_genetic_algorithm(engine, table, processing_capacity, bandwidth_capacity,
+                          population_size=PopulationSize, num_of_generations=NumOfGenerations,
+                          tournament_size=TournamentSize, crossover_rate=CrossoverRate,
+                          mutation_rate=MutationRate, num_of_elites=NumOfElites,
+                          patience=ConvergencePatience, time_budget=GATimeBudget,
+                          fitness_function=deployed_count_fitness, seed=None, population=None,
+                          population_initializer=None):
+    # population_initializer(size, seed) 를 지정하면 초기 population 생성을 대신 수행 (예: parallel.ParallelExecutor)
+    started_at = time.perf_counter()
+    init_seed, evolve_seed = as_seed_sequence(seed).spawn(2)
+    rng = np.random.default_rng(evolve_seed)
+    if population is None and population_initializer is not None:
+        population = population_initializer(population_size, init_seed)
+    elif population is None:
+        population = initialize_population(engine, table, processing_capacity, bandwidth_capacity,
+                                           population_size, init_seed)
+    initialized_at = time.perf_counter()
+    initial_failed_workflows = (~population.deployed).sum(axis=1)
+    population.fitness = fitness_function(population)
+    num_of_elites = min(num_of_elites, len(population))
+    timings = {"population_init": initialized_at - started_at, "fitness": time.perf_counter() - initialized_at}
+
+    history = [float(population.fitness.max())]
+    best_fitness = history[0]
+    stale_generations = 0
+    generation = 0
+    stop_reason = "generations"
+    while generation < num_of_generations:
+        if time_budget is not None and time.perf_counter() - started_at >= time_budget:
+            stop_reason = "time_budget"
+            break
+        if patience is not None and stale_generations >= patience:
+            stop_reason = "converged"
+            break
+
+        num_of_child = len(population) - num_of_elites
+        elites = population.take(np.argsort(-population.fitness, kind="stable")[:num_of_elites])
+        parents_a = tournament_select(population.fitness, num_of_child, tournament_size, rng)
+        parents_b = tournament_select(population.fitness, num_of_child, tournament_size, rng)
+        children = crossover(population, parents_a, parents_b, crossover_rate,
+                             processing_capacity, bandwidth_capacity, table, rng)
+        repair_capacity(children, table, rng)
+        # repair 로 제거된 워크플로우뿐 아니라 부모로부터 미배치 상태로 물려받은 워크플로우도 모두 다시 배치 시도
+        mutate(children, mutation_rate, engine, table, rng, pending=~children.deployed)
+        fitness_started_at = time.perf_counter()
+        children.fitness = fitness_function(children)
+        timings["fitness"] += time.perf_counter() - fitness_started_at
+        population = concatenate_populations(elites, children)
+
+        generation += 1
+        history.append(float(population.fitness.max()))
+        if history[-1] > best_fitness:
+            best_fitness = history[-1]
+            stale_generations = 0
+        else:
+            stale_generations += 1
+
+    timings["evolution"] = time.perf_counter() - started_at - timings["population_init"] - timings["fitness"]
+    return GAResult(population, int(np.argmax(population.fitness)), history, generation, stop_reason, timings,
+                    initial_failed_workflows)
+
+
+def to_chromosome(population, index, table, delay_factor_values):
+    # 배열로 저장된 개체를 기존 Chromosome(workflow_status) 형태로 변환
+    temp_chromosome = Chromosome(population.processing[index].copy(), population.bandwidth[index].copy(),
+                                 np.array(delay_factor_values))
+    for workflow in range(table.num_workflows):
+        if population.deployed[index, workflow]:
+            visited_node_info = population.placements[index, workflow, :table.num_tasks[workflow]].tolist()
+            temp_chromosome.workflow_status.append((workflow + 1, True, visited_node_info))
+        else:
+            temp_chromosome.workflow_status.append((workflow + 1, False, [0, ]))
+    return temp_chromosome
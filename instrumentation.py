@@ -0,0 +1,100 @@
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+
+logger = logging.getLogger("taskallocation")  # 기본적으로 출력하지 않음 (configure_logging 으로 활성화)
+logger.addHandler(logging.NullHandler())
+
+
+def configure_logging(verbosity=0):
+    # verbosity: 0 = 경고만, 1 = INFO, 2 이상 = DEBUG ([DBG] 출력)
+    level = logging.WARNING if verbosity <= 0 else logging.INFO if verbosity == 1 else logging.DEBUG
+    logging.basicConfig(format="[%(levelname)s] %(message)s")
+    logger.setLevel(level)
+
+
+class PlacementStats:
+    # 워크플로우 배치 탐색 카운터
+
+    def __init__(self):
+        self.placed = 0  # 배치에 성공한 워크플로우 수
+        self.failed = 0  # 배치에 실패한 워크플로우 수
+        self.expanded = 0  # 확장한 노드 수
+        self.pruned = 0  # 자원/방문 조건으로 제외된 이웃 수
+        self.backtracks = 0  # 되돌아간 횟수
+        self.budget_exhausted = 0  # 확장 한도에 도달하여 중단한 횟수
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+    def add(self, counters):
+        for name, value in counters.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def reset(self):
+        self.__init__()
+
+
+class Metrics:
+    # 단계별 실행 시간(초), 카운터, 프로파일 결과를 모아 dict/JSON 으로 제공
+
+    def __init__(self, profile=False, profile_path=None, profile_limit=20):
+        self.phases = {}
+        self.counters = {}
+        self.values = {}
+        self.profile_enabled = profile or profile_path is not None
+        self.profile_path = profile_path
+        self.profile_limit = profile_limit
+        self.profile_stats = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    @contextlib.contextmanager
+    def profile(self):
+        # profile 이 활성화된 경우에만 cProfile 로 감싸서 상위 함수들의 누적 시간을 기록
+        if not self.profile_enabled:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            if self.profile_path is not None:
+                profiler.dump_stats(self.profile_path)
+            stats = pstats.Stats(profiler, stream=io.StringIO()).sort_stats("cumulative")
+            rows = []
+            for (filename, line, function), (_, calls, total_time, cumulative_time, _) in stats.stats.items():
+                rows.append({"function": "%s:%d(%s)" % (filename, line, function), "calls": calls,
+                             "total_time": total_time, "cumulative_time": cumulative_time})
+            rows.sort(key=lambda row: row["cumulative_time"], reverse=True)
+            self.profile_stats = rows[:self.profile_limit]
+
+    def as_dict(self):
+        metrics = {"phases": dict(self.phases), "counters": dict(self.counters), "values": dict(self.values)}
+        if self.profile_stats is not None:
+            metrics["profile"] = self.profile_stats
+        return metrics
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
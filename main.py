@@ -1,287 +1,102 @@
-from random import *
-from math import *
-from parameters import *
-from chromosome import *
-import copy
-import matplotlib.pyplot as plt
+import argparse
+import dataclasses
+import json
+import logging
 
+from simulation import *
+from dynamic import DynamicSimulation
+from instrumentation import configure_logging, logger
+from snapshot import load_scenario, save_scenario
 
-def deploy_drone_edge_cloud(temp_position_info):  # Drone 배치하고 거리에 따라서 연결 정보 갱신
-    min_value = 1
-    max_value = SizeOfMonitoringArea
-    for _ in range(NumOfDrones):
-        pos_x = randint(min_value, max_value)
-        pos_y = randint(min_value, max_value)
-        NodeXPositions.append(pos_x)
-        NodeYPositions.append(pos_y)
-        temp_position_info.append((pos_x, pos_y))
 
-    min_value = SizeOfMonitoringArea + 1
-    max_value = SizeOfMonitoringArea + EdgeServerArea
-    for _ in range(NumOfEdgeServer):
-        pos_x = randint(min_value, max_value)
-        pos_y = randint(1, SizeOfMonitoringArea)
-        NodeXPositions.append(pos_x)
-        NodeYPositions.append(pos_y)
-        temp_position_info.append((pos_x, pos_y))
-
-    min_value = SizeOfMonitoringArea + EdgeServerArea + 1
-    max_value = SizeOfMonitoringArea + EdgeServerArea + CloudServerArea
-    for _ in range(NumOfCloudServer):
-        pos_x = randint(min_value, max_value)
-        pos_y = randint(1, SizeOfMonitoringArea)
-        NodeXPositions.append(pos_x)
-        NodeYPositions.append(pos_y)
-        temp_position_info.append((pos_x, pos_y))
-    print(len(temp_position_info))
-    print(temp_position_info)
-
-
-def update_connection_info_d2d(temp_connection_info, temp_node_position_info):  # 네트워크 연결 정보 설정(에지 서버와 클라우드 서버)
-    num_connection = 0
-    for index1 in range(1, NumOfDrones):
-        for index2 in range(index1 + 1, NumOfDrones + 1):
-            distance_x = abs(temp_node_position_info[index1][0] - temp_node_position_info[index2][0])
-            distance_y = abs(temp_node_position_info[index1][1] - temp_node_position_info[index2][1])
-            if sqrt(distance_x**2 + distance_y**2) <= TransRangeOfDrone:
-                # print("Can connect each other")
-                num_connection += 1
-                temp_connection_info[index1][index2] = 1
-                temp_connection_info[index2][index1] = 1
-                plt.plot([temp_node_position_info[index1][0], temp_node_position_info[index2][0]],
-                         [temp_node_position_info[index1][1], temp_node_position_info[index2][1]], color="green")
-    if True:  # 드론과 에지 서버와의 통신 가능 설정(4G, LTE 등과 같은 기법으로 1-Hop 통신이 가능하다고 가정)
-        for index1 in range(1, NumOfDrones):
-            for index2 in range(NumOfDrones + 1, NumOfDrones + NumOfEdgeServer + 1):
-                temp_connection_info[index1][index2] = 1
-                temp_connection_info[index2][index1] = 1
-                # plt.plot([temp_node_position_info[index1][0], temp_node_position_info[index2][0]],
-                #          [temp_node_position_info[index1][1], temp_node_position_info[index2][1]], color="black")
-    print("[DBG]", "The Number of Total Connection", num_connection)
-
-
-def update_connection_info_e2c(temp_connection_info, temp_node_position_info):  # 네트워크 연결 정보 설정(에지 서버와 클라우드 서버)
-    for index1 in range(NumOfDrones + 1, NumOfDrones + NumOfEdgeServer + 1):
-        for index2 in range(NumOfDrones + NumOfEdgeServer + 1, MAX_MATRIX_INDEX + 1):
-            temp_connection_info[index1][index2] = 1
-            temp_connection_info[index2][index1] = 1
-            plt.plot([temp_node_position_info[index1][0], temp_node_position_info[index2][0]],
-                     [temp_node_position_info[index1][1], temp_node_position_info[index2][1]], color="black")
-
-
-def display_connection_info(temp_connection_info):  # 현재 내트워크 연결 정보 출력
-    for index1 in range(1, MAX_MATRIX_INDEX + 1):
-        for index2 in range(1, MAX_MATRIX_INDEX + 1):
-            print(temp_connection_info[index1][index2], end=' ')
-        print()
-
-
-def alloc_processing_power(temp_processing_rate_of_dec):  # 프로세싱 파워 초기화
-    for _ in range(0, NumOfDrones):
-        temp_processing_rate_of_dec.append(MaxProcessingRateOfDrone)
-    for _ in range(0, NumOfEdgeServer):
-        temp_processing_rate_of_dec.append(MaxProcessingRateOfEdgeServer)
-    for _ in range(0, NumOfCloudServer):
-        temp_processing_rate_of_dec.append(MaxProcessingRateOfCloudServer)
-
-
-def alloc_delay_factor(temp_delay_factor_of_dec):  # 딜레이 factor 초기화
-    for _ in range(0, NumOfDrones):
-        temp_delay_factor_of_dec.append(MaxDelayFactorOfDrone)
-    for _ in range(0, NumOfEdgeServer):
-        temp_delay_factor_of_dec.append(MaxDelayFactorOfEdgeServer)
-    for _ in range(0, NumOfCloudServer):
-        temp_delay_factor_of_dec.append(MaxDelayFactorOfCloudServer)
-
-
-def alloc_bandwidth(temp_alloc_bandwidth_of_dec):  # 대역폭 초기화
-    for _ in range(0, NumOfDrones):
-        temp_alloc_bandwidth_of_dec.append(BandwidthOfDrone)
-    for _ in range(0, NumOfEdgeServer):
-        temp_alloc_bandwidth_of_dec.append(BandwidthOfEdgeServer)
-    for _ in range(0, NumOfCloudServer):
-        temp_alloc_bandwidth_of_dec.append(BandwidthOfCloudServer)
-
-
-def make_workflows(temp_workflow_info):
-    for index in range(NumOfWorkflows):
-        num_of_task = randint(MinTasksPerWorkFlow, MaxTasksPerWorkflow)
-        temp_task = []
-        for index2 in range(1, num_of_task + 1):
-            required_processing_power = randint(MinRequiredProcessingPower, MaxRequiredProcessingPower)
-            required_bandwidth = randint(MinRequiredBandwidth, MaxRequiredBandwidth)
-            temp_task.append((index2, required_processing_power, required_bandwidth))
-        temp_workflow_info.append(temp_task)
-
-
-def allocate_workflows_to_topology(cur_connection_info, workflow, start_node, cur_node, cur_task, visited_node):
-    if cur_task == len(workflow):
-        print("[DBG]", "No of Tasks:", cur_task, ", Found allocatable case:", visited_node)
-        return True
-
-    for index in range(1, MAX_MATRIX_INDEX + 1):
-        if index != cur_node:
-            if cur_connection_info[cur_node][index] != 0 and index not in visited_node:
-                visited_node.append(index)
-                ret = allocate_workflows_to_topology(cur_connection_info, workflow, start_node,
-                                                     index, cur_task + 1, visited_node)
-                if ret is True:
-                    return True
-
-
-def set_resource_usage_on_topology(temp_chromosome, temp_visited_node_info, temp_workflow):
-    for index in range(len(temp_visited_node_info)):
-        temp_chromosome.processing_rate_of_dec[temp_visited_node_info[index]] -= temp_workflow[index][1]
-        temp_chromosome.bandwidth_of_dec[temp_visited_node_info[index]] -= temp_workflow[index][2]
-
-
-def allocate_workflows_to_topology_with_constraint(temp_chromosome, cur_connection_info, workflow, start_node,
-                                                   cur_node, cur_task, visited_node):
-    if cur_task == len(workflow):
-        # check remained resources at current checking node
-        # a workflow is consist of ( task number, required_processing_power, required_bandwidth )
-        # print("[DBG]", "current node is", cur_node)
-        if temp_chromosome.processing_rate_of_dec[cur_node] > workflow[cur_task - 1][1] and \
-                temp_chromosome.bandwidth_of_dec[cur_node] > workflow[cur_task - 1][2]:
-            print("[DBG]", "No of Tasks:", cur_task, ", Found allocatable case:", visited_node)
-            return True
-        else:
-            return False
-
-    for next_node in range(1, MAX_MATRIX_INDEX + 1):
-        if next_node != cur_node:
-            if cur_connection_info[cur_node][next_node] != 0 and \
-                    next_node not in visited_node:
-                # check remained resources at current checking node
-                # a workflow is consist of ( task number, required_processing_power, required_bandwidth )
-                if temp_chromosome.processing_rate_of_dec[cur_node] > workflow[cur_task - 1][1] and \
-                        temp_chromosome.bandwidth_of_dec[cur_node] > workflow[cur_task - 1][2]:
-                    visited_node.append(next_node)
-                    ret = allocate_workflows_to_topology_with_constraint(temp_chromosome, cur_connection_info,
-                                                                         workflow, start_node, next_node,
-                                                                         cur_task + 1, visited_node)
-                    if ret is True:
-                        return True
-                    else:
-                        return False
-
-    return False
+def display_connection_info(temp_topology):  # 현재 내트워크 연결 정보 출력 (DEBUG 레벨에서만 행렬을 만듦)
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    temp_connection_info = temp_topology.as_connection_info()
+    for index1 in range(1, temp_topology.max_index + 1):
+        logger.debug(" ".join(str(temp_connection_info[index1][index2])
+                              for index2 in range(1, temp_topology.max_index + 1)))
 
 
 def display_deployed_workflow(temp_deployed_status_of_workflows):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     for index in range(1, len(temp_deployed_status_of_workflows)):
         if temp_deployed_status_of_workflows[index][1] is True:
-            print("[DBG]", "Deployed workflow No =", temp_deployed_status_of_workflows[index][0],
-                  temp_deployed_status_of_workflows[index][2])
-
-
-def add_candidate_deployment(temp_node_position_info, temp_visited_node_info):  # 워크플로우 할당 현황 표시
-    r = random()
-    b = random()
-    g = random()
-    generated_color = (r, g, b)
-    num_of_total_visited_node = len(temp_visited_node_info)
-    for index1 in range(num_of_total_visited_node - 1):
-        start_node_index = temp_visited_node_info[index1]
-        end_node_index = temp_visited_node_info[index1 + 1]
-        plt.plot([temp_node_position_info[start_node_index][0], temp_node_position_info[end_node_index][0]],
-                 [temp_node_position_info[start_node_index][1], temp_node_position_info[end_node_index][1]],
-                 color=generated_color)
-
-
-def make_chromosome(temp_chromosome):
-    # 램덤 방식일 이용하여 각 워크플로우를 할당
-    num_of_deployed_workflow = 0
-    for i in range(1, NumOfWorkflows + 1):
-        rnd_start_node = randint(1, MAX_MATRIX_INDEX)
-        visited_node_info = [rnd_start_node]
-        print("[DBG]", "Initial starting node info.:", visited_node_info)
-
-        ret_value = allocate_workflows_to_topology_with_constraint(temp_chromosome, ConnectionInfo, WorkflowInfo[i],
-                                                                   start_node=rnd_start_node, cur_node=rnd_start_node,
-                                                                   cur_task=1,
-                                                                   visited_node=visited_node_info)
-
-        '''
-        ret_value = allocate_workflows_to_topology(ConnectionInfo, WorkflowInfo[i],
-                                                   start_node=Rnd_Start_Node, cur_node=Rnd_Start_Node, cur_task=1,
-                                                   visited_node=Visited_Node_Info)
-        '''
-        print(visited_node_info)  # 워크플로우가 배치된 노트 정보 출력
-
-        if ret_value is True:
-            temp_chromosome.workflow_status.append((i, True, visited_node_info))
-            num_of_deployed_workflow += 1
-            ''' 실제 토폴로지에서 리소스 사용(프로세싱 파워, 대역폭) 을 반영시킴 '''
-            set_resource_usage_on_topology(temp_chromosome, visited_node_info, WorkflowInfo[i])
-            add_candidate_deployment(NodePositionInfo, visited_node_info)  # 가시화를 위한 워크플로우의 배치 정보 추가
-        else:
-            temp_chromosome.workflow_status.append((i, False, [0, ]))
-            print("[DBG]", "current workflow is not allocated")
-
-    print("[DBG]", "# of allocated workflow = ", num_of_deployed_workflow)
-
-
-def calculate_performance_chromosome(temp_chromosome):
-    # 각 크로모좀의 성능 계산
-    total_allocated_processing_power = 0.0
-    total_allocated_bandwidth = 0.0
-    total_allocated_delay_factor = 0.0
-
-    for i in range(1, len(temp_chromosome.workflow_status)):
-        (workflow_id, workflow_status, allocated_node) = temp_chromosome.workflow_status[i]
-        if workflow_status is True:
-            for (task_id, required_processing_power, required_bandwidth) in WorkflowInfo[workflow_id]:
-                if task_id >= 0:
-                    total_allocated_processing_power += required_processing_power
-                    total_allocated_bandwidth += required_bandwidth
-            for node_id in allocated_node:
-                total_allocated_delay_factor += DelayFactorOfDEC[node_id]
-
-    print(total_allocated_processing_power, total_allocated_bandwidth, total_allocated_delay_factor)
-    return ()
-
-
-deploy_drone_edge_cloud(NodePositionInfo)  # 드론(UAV), 에지, 클라우드를 모니터링 대상 영역에 배치
-
-update_connection_info_e2c(ConnectionInfo, NodePositionInfo)  # 에지 서버와 클라우드 서버간의 연결 정보 생성
-
-update_connection_info_d2d(ConnectionInfo, NodePositionInfo)  # 드론간의 토폴로지 생성
-
-alloc_processing_power(ProcessingRateOfDEC)  # 드론, 에지 서버, 클라우드 서버의 프로세싱 rate 초기화
-
-alloc_delay_factor(DelayFactorOfDEC)  # 드론, 에지 서버, 클라우드 서버의 딜레이 factor 초기화
-
-alloc_bandwidth(BandwidthOfDEC)  # 드론, 에지 서버, 클라우드 서버의 bandwidth 초기화
-
-display_connection_info(ConnectionInfo)  # 전체 토폴로지 연결 정보 표시
-
-make_workflows(WorkflowInfo)  # workflow 를 생성
-
-''' Population 생성 '''
-Population = list()
-for _ in range(20):
-    sample_chromosome = Chromosome(copy.deepcopy(ProcessingRateOfDEC),
-                                   copy.deepcopy(BandwidthOfDEC),
-                                   copy.deepcopy(DelayFactorOfDEC))
-    make_chromosome(sample_chromosome)  # 샘플 크로모좀 생성
-    calculate_performance_chromosome(sample_chromosome)
-    Population.append(sample_chromosome)
-    display_deployed_workflow(sample_chromosome.workflow_status)
-
-# print(WorkflowInfo)
-# print(len(WorkflowInfo))
-
-# 드론들의 배치 상황과 연결 상황을 그래프로 표시
-plt.scatter(NodeXPositions[1:NumOfDrones + 1], NodeYPositions[1:NumOfDrones + 1], edgecolors="blue", s=30)
-plt.scatter(NodeXPositions[NumOfDrones + 1:NumOfDrones + NumOfEdgeServer + 1],
-            NodeYPositions[NumOfDrones + 1:NumOfDrones + NumOfEdgeServer + 1], edgecolors="black", s=80)
-plt.scatter(NodeXPositions[NumOfDrones + NumOfEdgeServer + 1:],
-            NodeYPositions[NumOfDrones + NumOfEdgeServer + 1:], edgecolors="red", s=150)
-plt.fill_between([1, SizeOfMonitoringArea],
-                 [SizeOfMonitoringArea, SizeOfMonitoringArea], alpha=0.1)
-plt.fill_between([SizeOfMonitoringArea, SizeOfMonitoringArea + EdgeServerArea],
-                 [SizeOfMonitoringArea, SizeOfMonitoringArea], alpha=0.2)
-plt.fill_between([SizeOfMonitoringArea + EdgeServerArea, SizeOfMonitoringArea + EdgeServerArea + CloudServerArea],
-                 [SizeOfMonitoringArea, SizeOfMonitoringArea], alpha=0.1)
-plt.show()
+            logger.debug("Deployed workflow No = %d %s", temp_deployed_status_of_workflows[index][0],
+                         temp_deployed_status_of_workflows[index][2])
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Workflow allocation for drone based IoT network")
+    parser.add_argument("--seed", type=int, default=RandomSeed, help="난수 시드")
+    parser.add_argument("--drones", type=int, dest="num_of_drones", help="UAV의 수")
+    parser.add_argument("--edge-servers", type=int, dest="num_of_edge_servers", help="에지 서버의 수")
+    parser.add_argument("--cloud-servers", type=int, dest="num_of_cloud_servers", help="클라우드 서버의 수")
+    parser.add_argument("--range", type=float, dest="trans_range_of_drone", help="드론의 통신 반경")
+    parser.add_argument("--workflows", type=int, dest="num_of_workflows", help="워크플로우 수")
+    parser.add_argument("--population", type=int, dest="population_size", help="population 의 크기")
+    parser.add_argument("--generations", type=int, dest="num_of_generations", help="최대 세대 수")
+    parser.add_argument("--path-cache", type=int, dest="path_cache_size", help="후보 경로 캐시의 최대 항목 수 (0: 사용 안 함)")
+    parser.add_argument("--max-hops", type=int, dest="max_hops_between_tasks", help="연속된 태스크 사이의 최대 hop 수 (1 ~ 254)")
+    parser.add_argument("--latency-weight", type=float, dest="fitness_weight_of_latency", help="전송 지연 합의 fitness 가중치")
+    parser.add_argument("--workers", type=int, dest="num_of_workers", help="병렬 실행 프로세스 수 (0: CPU 코어 수)")
+    parser.add_argument("--ticks", type=int, default=NumOfTicks, help="동적 모드(드론 이동)에서 수행할 시간 단계 수")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="로그 출력 (-v: INFO, -vv: DEBUG)")
+    parser.add_argument("--metrics", dest="metrics_output", help="실행 시간/탐색 카운터를 JSON 으로 저장할 파일 경로")
+    parser.add_argument("--profile", dest="profile_output", help="cProfile 결과(pstats)를 저장할 파일 경로")
+    parser.add_argument("--save-scenario", help="생성한 시나리오를 바이너리 스냅샷으로 저장할 파일 경로")
+    parser.add_argument("--load-scenario", help="시나리오를 생성하지 않고 불러올 스냅샷 파일 경로")
+    parser.add_argument("--headless", action="store_true", default=HeadlessMode, help="matplotlib 을 사용하지 않음")
+    parser.add_argument("--output", default=FigureOutputPath, help="결과 그림을 저장할 파일 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    configure_logging(arguments.verbose)
+    overrides = {field.name: getattr(arguments, field.name) for field in dataclasses.fields(SimulationConfig)
+                 if getattr(arguments, field.name, None) is not None}
+    if overrides.get("num_of_workers") == 0:
+        overrides["num_of_workers"] = None
+    scenario = None
+    if arguments.load_scenario is not None:  # 스냅샷의 설정에 명령행에서 지정한 값(GA 파라미터 등)을 덮어씀
+        changed = sorted(set(overrides) & set(SCENARIO_FIELDS))
+        if changed:  # 시나리오를 결정하는 값은 스냅샷과 맞지 않게 되므로 변경할 수 없음
+            raise SystemExit("error: cannot override %s when loading a scenario" % ", ".join(changed))
+        scenario = load_scenario(arguments.load_scenario)
+    try:
+        config = (scenario.config if scenario is not None else SimulationConfig()).replace(**overrides)
+    except ValueError as error:
+        raise SystemExit("error: %s" % error)
+    if arguments.ticks > 0 and config.max_hops_between_tasks > 1:  # 동적 모드는 직접 연결된 링크 단위로 경로를 관리
+        raise SystemExit("error: --ticks cannot be combined with max_hops_between_tasks > 1")
+
+    result = run(config, arguments.seed, profile_path=arguments.profile_output, scenario=scenario)
+    if arguments.save_scenario is not None:
+        save_scenario(result.scenario, arguments.save_scenario)
+
+    display_connection_info(result.scenario.topology)  # 전체 토폴로지 연결 정보 표시
+    display_deployed_workflow(result.best_chromosome().workflow_status)
+
+    if arguments.ticks > 0:  # 드론을 이동시키며 영향을 받은 워크플로우만 다시 배치
+        dynamic_simulation = DynamicSimulation.from_result(result, seed=arguments.seed)
+        for stats in dynamic_simulation.run(arguments.ticks):
+            logger.info("Tick %s", stats.as_dict())
+
+    print(json.dumps(result.summary()))
+    if arguments.metrics_output is not None:
+        with open(arguments.metrics_output, "w") as metrics_file:
+            metrics_file.write(result.metrics.to_json(indent=2))
+
+    # 드론들의 배치 상황, 연결 상황, 최종 워크플로우 배치를 그래프로 표시 (헤드리스 모드에서는 matplotlib 을 불러오지 않음)
+    if not arguments.headless:
+        from visualization import render_result
+        render_result(result.scenario.topology, result.best_paths(), output_path=arguments.output,
+                      show=arguments.output is None, monitoring_area=config.size_of_monitoring_area,
+                      edge_server_area=config.edge_server_area, cloud_server_area=config.cloud_server_area)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from fitness import FitnessEvaluator
+from genetic import Population, individual_seeds, place_workflow_genes
+from instrumentation import PlacementStats
+from parameters import *
+from path_cache import PathCache, PathCacheStats
+from placement import PlacementEngine
+from routing import RoutedTopology, RoutingTable
+from topology import Topology
+from workload import WorkflowTable
+
+_worker_state = {}  # 작업 프로세스에서 공유 메모리에 연결된 배열과 엔진
+
+
+class SharedArrays:
+    # numpy 배열들을 공유 메모리에 한 번만 게시하고, 작업 프로세스에는 이름/shape/dtype 만 전달
+
+    def __init__(self, arrays):
+        self.blocks = {}
+        self.arrays = {}
+        self.descriptor = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            shared[...] = array
+            self.blocks[name] = block
+            self.arrays[name] = shared
+            self.descriptor[name] = (block.name, array.shape, array.dtype.str)
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def close(self):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def attach_shared_arrays(descriptor):
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in descriptor.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+def _init_worker(descriptor, node_counts, max_expansions, fitness_weights, path_cache_options, max_hops,
+                 snapshot_path=None):
+    arrays, blocks = attach_shared_arrays(descriptor)
+    if snapshot_path is not None:  # 시나리오 배열은 스냅샷 파일을 읽기 전용으로 memory map 하여 공유
+        from snapshot import map_arrays
+        arrays = dict(map_arrays(snapshot_path), **arrays)
+    num_drones, num_edge_servers, num_cloud_servers = node_counts
+    topology = Topology(arrays["x_positions"], arrays["y_positions"], num_drones, num_edge_servers,
+                        num_cloud_servers, arrays["indptr"], arrays["indices"])
+    table = WorkflowTable(arrays["num_tasks"], arrays["task_processing"], arrays["task_bandwidth"])
+    latency = None
+    if "routing_hops" in arrays:
+        routing = RoutingTable(arrays["routing_hops"], arrays["routing_latency"])
+        latency = routing.latency
+        if max_hops > 1:
+            topology = RoutedTopology(topology, routing, max_hops)
+    _worker_state["blocks"] = blocks
+    _worker_state["arrays"] = arrays
+    _worker_state["table"] = table
+    engine = PlacementEngine(topology, max_expansions)
+    path_cache_size, path_cache_candidates = path_cache_options
+    if path_cache_size > 0:
+        engine = PathCache(engine, path_cache_size, path_cache_candidates, max_expansions)
+    _worker_state["engine"] = engine
+    _worker_state["evaluator"] = FitnessEvaluator(table, arrays["delay_factor"], *fitness_weights, latency=latency)
+
+
+def _worker_population(start, stop):
+    arrays = _worker_state["arrays"]
+    return Population(arrays["placements"][start:stop], arrays["deployed"][start:stop],
+                      arrays["processing"][start:stop], arrays["bandwidth"][start:stop])
+
+
+def _initialize_rows(start, seeds):
+    # start 번째 개체부터 len(seeds) 개의 개체를 생성하여 공유 메모리의 population 배열에 직접 기록
+    arrays = _worker_state["arrays"]
+    table = _worker_state["table"]
+    population = _worker_population(start, start + len(seeds))
+    population.placements[...] = 0
+    population.deployed[...] = False
+    population.processing[...] = arrays["processing_capacity"]
+    population.bandwidth[...] = arrays["bandwidth_capacity"]
+    engine = _worker_state["engine"]
+    engine.stats.reset()
+    cache_stats = getattr(engine, "cache_stats", PathCacheStats())
+    cache_stats.reset()
+    workflows = range(table.num_workflows)
+    for index, individual_seed in enumerate(seeds):
+        place_workflow_genes(population, index, workflows, engine, table, np.random.default_rng(individual_seed))
+    return engine.stats.as_dict(), cache_stats.as_dict()  # 작업 단위 배치 탐색/캐시 카운터
+
+
+def _evaluate_rows(start, stop):
+    population = _worker_population(start, stop)
+    _worker_state["arrays"]["fitness"][start:stop] = _worker_state["evaluator"](population)
+    return stop - start
+
+
+class ParallelExecutor:
+    # population 초기화와 fitness 계산을 프로세스 풀에서 수행
+    # 토폴로지, 노드 자원, 워크플로우 테이블은 공유 메모리로 한 번만 게시되며,
+    # routing 테이블이 주어지면 함께 게시하여 다중 hop 배치와 전송 지연 계산에 사용
+    # snapshot_path 가 주어지면 시나리오 배열은 복사하지 않고 작업 프로세스가 스냅샷 파일을 직접 memory map 함
+    # 개체별 RNG 시드를 사용하므로 같은 시드의 직렬 실행(genetic.initialize_population)과 결과가 동일
+
+    def __init__(self, topology, table, processing_capacity, bandwidth_capacity, delay_factor_values,
+                 population_size, num_workers=NumOfWorkers, max_expansions=PlacementExpansionBudget,
+                 fitness_evaluator=None, chunks_per_worker=4, path_cache_size=PathCacheSize,
+                 path_cache_candidates=PathCacheCandidates, routing=None, max_hops_between_tasks=MaxHopsBetweenTasks,
+                 snapshot_path=None):
+        num_workers = num_workers or multiprocessing.cpu_count()
+        if fitness_evaluator is None:
+            fitness_evaluator = FitnessEvaluator(table, delay_factor_values)
+        fitness_weights = (fitness_evaluator.weight_of_deployed, fitness_evaluator.weight_of_processing,
+                           fitness_evaluator.weight_of_bandwidth, fitness_evaluator.weight_of_delay,
+                           fitness_evaluator.weight_of_latency)
+        num_nodes = topology.num_nodes
+        self.population_size = population_size
+        self.num_workers = num_workers
+        self.chunks_per_worker = chunks_per_worker
+        self.placement_stats = PlacementStats()  # 작업 프로세스들의 배치 탐색 카운터 합
+        self.path_cache_stats = PathCacheStats()  # 작업 프로세스들의 후보 경로 캐시 카운터 합
+        scenario_arrays = {
+            "x_positions": topology.x_positions,
+            "y_positions": topology.y_positions,
+            "indptr": topology.indptr,
+            "indices": topology.indices,
+            "num_tasks": table.num_tasks,
+            "task_processing": table.processing,
+            "task_bandwidth": table.bandwidth,
+            "delay_factor": np.asarray(delay_factor_values, dtype=np.float64),
+            "processing_capacity": np.asarray(processing_capacity, dtype=np.int64),
+            "bandwidth_capacity": np.asarray(bandwidth_capacity, dtype=np.int64),
+        }
+        if routing is not None:
+            scenario_arrays["routing_hops"] = routing.hops
+            scenario_arrays["routing_latency"] = routing.latency
+        arrays = {
+            "placements": np.zeros((population_size, table.num_workflows, table.max_tasks), dtype=np.int32),
+            "deployed": np.zeros((population_size, table.num_workflows), dtype=bool),
+            "processing": np.zeros((population_size, num_nodes), dtype=np.int64),
+            "bandwidth": np.zeros((population_size, num_nodes), dtype=np.int64),
+            "fitness": np.zeros(population_size, dtype=np.float64),
+        }
+        if snapshot_path is not None:  # 스냅샷에 없는 배열(예: 불러온 뒤 계산한 routing 테이블)만 공유 메모리로 게시
+            from snapshot import read_header
+            stored = read_header(snapshot_path)["arrays"]
+            scenario_arrays = {name: array for name, array in scenario_arrays.items() if name not in stored}
+        arrays.update(scenario_arrays)
+        self.shared = SharedArrays(arrays)
+        node_counts = (topology.num_drones, topology.num_edge_servers, topology.num_cloud_servers)
+        self.pool = multiprocessing.Pool(num_workers, initializer=_init_worker,
+                                         initargs=(self.shared.descriptor, node_counts, max_expansions,
+                                                   fitness_weights, (path_cache_size, path_cache_candidates),
+                                                   max_hops_between_tasks, snapshot_path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        self.shared.close()
+
+    def _chunks(self, size):
+        num_chunks = min(size, self.num_workers * self.chunks_per_worker) or 1
+        bounds = np.linspace(0, size, num_chunks + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    def initialize_population(self, size, seed=None):
+        if size > self.population_size:
+            raise ValueError("population size %d exceeds shared capacity %d" % (size, self.population_size))
+        seeds = individual_seeds(seed, size)
+        for placement_counters, cache_counters in self.pool.starmap(
+                _initialize_rows, [(start, seeds[start:stop]) for start, stop in self._chunks(size)]):
+            self.placement_stats.add(placement_counters)
+            self.path_cache_stats.add(cache_counters)
+        return Population(self.shared["placements"][:size].copy(), self.shared["deployed"][:size].copy(),
+                          self.shared["processing"][:size].copy(), self.shared["bandwidth"][:size].copy())
+
+    def evaluate(self, population):
+        size = len(population)
+        if size > self.population_size:
+            raise ValueError("population size %d exceeds shared capacity %d" % (size, self.population_size))
+        self.shared["placements"][:size] = population.placements
+        self.shared["deployed"][:size] = population.deployed
+        self.pool.starmap(_evaluate_rows, self._chunks(size))
+        return self.shared["fitness"][:size].copy()
+
+    __call__ = evaluate
@@ -38,21 +38,53 @@ MaxRequiredProcessingPower = 30  # 각 태스크의 최대 소모 프로세싱 
 MinRequiredBandwidth = 20  # 각 태스크의 최소 대역폭 파워 (기본: 50)
 MaxRequiredBandwidth = 30  # 각 태스크의 최대 대역폭 파워 (기본: 200)
 
-NodeXPositions = [0, ]  # 그래프로 각 노드 위치를 표기하기 위한 X좌표 배열
-NodeYPositions = [0, ]  # 그래프로 각 노드 위치를 표기하기 위한 Y좌표 배열
+''' 워크플로우 배치 탐색 파라미터 '''
+PlacementExpansionBudget = 10000  # 워크플로우 하나를 배치할 때 확장할 수 있는 최대 노드 수 (None: 제한 없음)
+PathCacheSize = 0  # (시작 노드, 태스크 수) 별 후보 경로를 저장하는 LRU 캐시의 최대 항목 수 (0: 캐시 사용 안 함, 기본: 0)
+# 캐시를 사용하면 배치가 약 1.4배 빨라지지만 고정된 후보 경로에서만 고르므로 해의 품질이 약간 낮아지고,
+# 동적 모드에서는 링크가 바뀔 때마다 무효화가 일어나 오히려 느려짐
+PathCacheCandidates = 32  # 캐시 항목 하나에 저장하는 후보 경로 수 (기본: 32)
+
+''' 라우팅 테이블 파라미터 '''
+MaxHopsBetweenTasks = 1  # 연속된 두 태스크가 배치될 수 있는 노드 사이의 최대 hop 수 (1: 직접 연결된 노드만, 기본: 1)
+TransferDataSize = 100  # 태스크 사이에 전송하는 데이터 크기 (링크 전송 지연 = 데이터 크기 / 두 노드 대역폭 중 작은 값)
+RoutingFloydWarshallMaxNodes = 500  # 노드 수가 이 값 이하이면 Floyd-Warshall, 초과하면 희소 그래프 반복 완화로 계산
+
+''' 유전 알고리즘 파라미터 '''
+PopulationSize = 20  # population 의 크기 (기본: 20)
+NumOfGenerations = 100  # 최대 세대 수 (기본: 100)
+TournamentSize = 3  # 토너먼트 선택에 참여하는 개체 수 (기본: 3)
+CrossoverRate = 0.9  # crossover 확률 (기본: 0.9)
+MutationRate = 0.05  # 워크플로우(유전자) 단위의 mutation 확률 (기본: 0.05)
+NumOfElites = 2  # 다음 세대로 그대로 복사되는 상위 개체 수 (기본: 2)
+ConvergencePatience = 20  # 최고 fitness 가 개선되지 않으면 종료하는 세대 수 (None: 사용하지 않음)
+GATimeBudget = None  # 유전 알고리즘의 최대 실행 시간(초) (None: 제한 없음)
+RandomSeed = None  # 유전 알고리즘의 난수 시드 (None: 매 실행마다 다름)
+
+''' 병렬 실행 파라미터 '''
+NumOfWorkers = 1  # population 초기화/fitness 계산에 사용하는 프로세스 수 (1: 직렬 실행, None: CPU 코어 수)
+
+''' 드론 이동(동적 모드) 파라미터 '''
+NumOfTicks = 0  # 동적 모드에서 수행할 시간 단계 수 (0: 동적 모드를 사용하지 않음)
+MobilityMaxStep = 5  # 한 tick 동안 드론이 이동하는 최대 거리 (기본: 5)
+MobilityMoveProbability = 0.1  # 한 tick 동안 각 드론이 이동할 확률 (기본: 0.1)
+PendingRetriesPerTick = 10  # 배치에 실패한 워크플로우 중 tick 마다 다시 시도하는 최대 수 (기본: 10)
+
+''' 온라인 배치(admission) 서비스 파라미터 '''
+AdmissionBatchSize = 64  # 한 번에 처리하는 요청(micro-batch)의 최대 수 (기본: 64)
+AdmissionBatchDelay = 0.001  # 첫 요청이 도착한 뒤 micro-batch 를 모으는 시간(초) (0: 기다리지 않음)
+LoadGeneratorRate = 1000  # 부하 생성기의 초당 요청 수 (0: 최대한 빠르게)
+LoadGeneratorHoldTime = 0.5  # 부하 생성기 요청의 평균 자원 점유 시간(초)
+
+''' 가시화 파라미터 '''
+HeadlessMode = False  # True 이면 matplotlib 을 사용하지 않고 시뮬레이션만 수행 (기본: False)
+FigureOutputPath = None  # 결과 그림을 저장할 파일 경로 (None: 화면에 표시)
+
+''' Fitness 가중치 파라미터 (fitness = 배치 수 + 프로세싱 + 대역폭 - 딜레이 factor - 전송 지연에 각 가중치를 곱한 합) '''
+FitnessWeightOfDeployed = 1.0  # 배치된 워크플로우 수의 가중치 (기본: 1.0)
+FitnessWeightOfProcessing = 0.0  # 할당된 프로세싱 파워 합의 가중치 (기본: 0.0)
+FitnessWeightOfBandwidth = 0.0  # 할당된 대역폭 합의 가중치 (기본: 0.0)
+FitnessWeightOfDelay = 0.01  # 배치된 노드의 딜레이 factor 합의 가중치 (기본: 0.01)
+FitnessWeightOfLatency = 0.0  # 배치된 워크플로우의 태스크 간 전송 지연 합의 가중치 (0: 라우팅 테이블 사용 안 함, 기본: 0.0)
 
 MAX_MATRIX_INDEX = NumOfDrones + NumOfEdgeServer + NumOfCloudServer  # 네트워크 연결 정보 저장 테이블의 최대 인덱스
-
-ConnectionInfo = [[0 for _ in range(MAX_MATRIX_INDEX + 1)] for __ in range(MAX_MATRIX_INDEX + 1)]  # 네트워크 연결 정보 초기화
-
-NodePositionInfo = [(0, 0), ]  # 드론, 에지서버, 클라우드 서버의 위치 정보 저장
-
-ProcessingRateOfDEC = [0, ]  # 각 드론, 에지서버, 클라우드 서버의 프로세싱 rate 저장
-
-DelayFactorOfDEC = [0, ]  # 각 드론, 에지서버, 클라우드 서버의 딜레이 factor 저장
-
-BandwidthOfDEC = [0, ]  # 각 드론, 에지서버, 클라우서버의 대역폭 저장
-
-WorkflowInfo = [0, ]  # sequential 워크플로우 정보 저장 [(태스크 번호, 프로세싱 요구량, 대역폭요구량), ...]
-
-DeployedStatusOfWorkflows = [0, ]  # 각 워크플로우의 배치 여부
@@ -0,0 +1,147 @@
+import collections
+
+import numpy as np
+
+from parameters import *
+
+
+class PathCacheStats:
+
+    def __init__(self):
+        self.hits = 0  # 캐시된 후보 경로로 배치에 성공한 횟수
+        self.misses = 0  # 후보 경로를 새로 탐색한 횟수
+        self.fallbacks = 0  # 후보 경로가 모두 자원 부족이어서 배치 엔진으로 탐색한 횟수
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+    def add(self, counters):
+        for name, value in counters.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def reset(self):
+        self.__init__()
+
+
+class PathCache:
+    # (시작 노드, 태스크 수) 별로 연결 조건만 만족하는 k-hop 경로 후보들을 LRU 로 저장하고,
+    # 배치할 때 현재 남은 자원으로 후보들을 한 번에 검사. 만족하는 후보가 없으면 배치 엔진으로 탐색
+    # 후보 경로는 (시작 노드, 태스크 수) 로 정해지는 순서로 탐색하므로 캐시 상태와 무관하게 배치 결과가 같음
+    # PlacementEngine 과 같은 place() / topology / stats 를 제공하여 그대로 대체하여 사용할 수 있음
+
+    def __init__(self, engine, max_entries=PathCacheSize, paths_per_entry=PathCacheCandidates,
+                 max_expansions=PlacementExpansionBudget):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.paths_per_entry = paths_per_entry
+        self.max_expansions = max_expansions  # 후보 경로 탐색 시 최대 노드 확장 수
+        self.entries = collections.OrderedDict()  # (시작 노드, 태스크 수) -> (후보 수, 태스크 수) 배열
+        self.keys_on_node = {}  # 노드 -> 그 노드를 지나는 후보를 가진 키 집합
+        self.cache_stats = PathCacheStats()
+
+    @property
+    def topology(self):
+        return self.engine.topology
+
+    @property
+    def stats(self):
+        return self.engine.stats
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, start_node, num_of_task):
+        key = (int(start_node), int(num_of_task))
+        paths = self.entries.get(key)
+        if paths is not None:
+            self.entries.move_to_end(key)
+            return paths
+        self.cache_stats.misses += 1
+        paths = self.enumerate_paths(key[0], key[1])
+        self.entries[key] = paths
+        for node in np.unique(paths).tolist():
+            self.keys_on_node.setdefault(node, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self.cache_stats.evictions += 1
+        return paths
+
+    def enumerate_paths(self, start_node, num_of_task):
+        # 자원 조건 없이 연결된 노드만 따라가는 단순 경로(같은 노드를 두 번 지나지 않음)를 최대 paths_per_entry 개 탐색
+        if num_of_task <= 1:
+            return np.array([[start_node]] * (num_of_task == 1), dtype=np.int64).reshape(-1, num_of_task)
+        topology = self.topology
+        rng = np.random.default_rng([start_node, num_of_task])
+        paths = []
+        path = [start_node]
+        on_path = {start_node}
+        stack = [(rng.permutation(topology.neighbors(start_node)), 0)]
+        expansions = 1
+        while stack and len(paths) < self.paths_per_entry:
+            candidates, pos = stack[-1]
+            if pos >= len(candidates):
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            stack[-1] = (candidates, pos + 1)
+            next_node = int(candidates[pos])
+            if next_node in on_path:
+                continue
+            if len(path) + 1 == num_of_task:
+                paths.append(path + [next_node])
+                continue
+            if self.max_expansions is not None and expansions >= self.max_expansions:
+                break
+            expansions += 1
+            path.append(next_node)
+            on_path.add(next_node)
+            stack.append((rng.permutation(topology.neighbors(next_node)), 0))
+        return np.array(paths, dtype=np.int64).reshape(-1, num_of_task)
+
+    def place(self, processing, bandwidth, required_processing, required_bandwidth, start_node, rng=None):
+        num_of_task = len(required_processing)
+        if num_of_task == 0 or not (processing[start_node] > required_processing[0] and
+                                    bandwidth[start_node] > required_bandwidth[0]):
+            return self.engine.place(processing, bandwidth, required_processing, required_bandwidth, start_node, rng)
+        paths = self.lookup(start_node, num_of_task)
+        if len(paths):
+            feasible = (processing[paths] > np.asarray(required_processing)).all(axis=1)
+            feasible &= (bandwidth[paths] > np.asarray(required_bandwidth)).all(axis=1)
+            feasible = np.nonzero(feasible)[0]
+            if len(feasible):
+                choice = feasible[int(rng.integers(len(feasible)))] if rng is not None else feasible[0]
+                self.cache_stats.hits += 1
+                self.engine.stats.placed += 1
+                return paths[choice].tolist()
+        self.cache_stats.fallbacks += 1
+        return self.engine.place(processing, bandwidth, required_processing, required_bandwidth, start_node, rng)
+
+    def invalidate_nodes(self, nodes):
+        # 토폴로지가 바뀐 노드를 지나는 후보를 가진 항목만 제거
+        keys = set()
+        for node in nodes:
+            keys.update(self.keys_on_node.get(int(node), ()))
+        for key in keys:
+            self._remove(key)
+        self.cache_stats.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_links(self, links):
+        return self.invalidate_nodes({node for link in links for node in link})
+
+    def clear(self):
+        self.entries.clear()
+        self.keys_on_node.clear()
+
+    def _remove(self, key):
+        paths = self.entries.pop(key, None)
+        if paths is None:
+            return
+        for node in np.unique(paths).tolist():
+            keys = self.keys_on_node.get(node)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_on_node[node]
@@ -0,0 +1,90 @@
+import numpy as np
+
+from instrumentation import PlacementStats
+from parameters import PlacementExpansionBudget
+
+
+class PlacementEngine:
+    # 워크플로우의 태스크들을 인접한 노드에 순차적으로 배치하는 탐색 엔진
+    # 경로의 k 번째 노드가 k 번째 태스크를 수행하며, 각 노드는 남은 프로세싱 파워와 대역폭이
+    # 태스크의 요구량보다 커야 함 (기존 allocate_workflows_to_topology_with_constraint 와 같은 조건)
+
+    def __init__(self, topology, max_expansions=PlacementExpansionBudget):
+        self.topology = topology
+        self.max_expansions = max_expansions  # 워크플로우 하나당 최대 노드 확장 수 (None 이면 제한 없음)
+        self.visited = np.zeros(topology.num_nodes, dtype=bool)  # 방문 여부 (탐색이 끝나면 항상 False 로 복구)
+        self.stats = PlacementStats()
+
+    def feasible_next_nodes(self, cur_node, processing, bandwidth, required_processing, required_bandwidth):
+        nodes = self.topology.neighbors(cur_node)
+        mask = ~self.visited[nodes]
+        mask &= processing[nodes] > required_processing
+        mask &= bandwidth[nodes] > required_bandwidth
+        return nodes[mask]
+
+    def place(self, processing, bandwidth, required_processing, required_bandwidth, start_node, rng=None):
+        # 배치 가능한 경로(노드 번호 리스트)를 반환하고, 없으면 None 을 반환
+        # processing, bandwidth 는 노드별 남은 자원(numpy 배열)이며 이 함수에서 변경하지 않음
+        path = self._search(processing, bandwidth, required_processing, required_bandwidth, start_node, rng)
+        if path is None:
+            self.stats.failed += 1
+        else:
+            self.stats.placed += 1
+        return path
+
+    def _search(self, processing, bandwidth, required_processing, required_bandwidth, start_node, rng):
+        num_of_task = len(required_processing)
+        if num_of_task == 0:
+            return []
+        if not (processing[start_node] > required_processing[0] and bandwidth[start_node] > required_bandwidth[0]):
+            return None
+        if num_of_task == 1:
+            return [start_node]
+
+        visited = self.visited
+        path = [start_node]
+        visited[start_node] = True
+        stack = [self._candidates(start_node, processing, bandwidth, required_processing[1], required_bandwidth[1],
+                                  rng)]
+        expansions = 1
+        try:
+            while stack:
+                candidates, pos = stack[-1]
+                if pos >= len(candidates):  # 더 이상 시도할 이웃이 없으면 이전 태스크로 되돌아감
+                    stack.pop()
+                    visited[path.pop()] = False
+                    self.stats.backtracks += 1
+                    continue
+                stack[-1] = (candidates, pos + 1)
+                next_node = int(candidates[pos])
+                if visited[next_node]:
+                    continue
+                path.append(next_node)
+                visited[next_node] = True
+                if len(path) == num_of_task:
+                    return path
+                if self.max_expansions is not None and expansions >= self.max_expansions:
+                    self.stats.budget_exhausted += 1
+                    return None
+                expansions += 1
+                cur_task = len(path)
+                stack.append(self._candidates(next_node, processing, bandwidth, required_processing[cur_task],
+                                              required_bandwidth[cur_task], rng))
+            return None
+        finally:
+            self.stats.expanded += expansions
+            visited[path] = False
+
+    def place_workflow(self, processing, bandwidth, workflow, start_node, rng=None):
+        # workflow 는 WorkflowInfo 와 같은 [(태스크 번호, 프로세싱 요구량, 대역폭 요구량), ...] 형태
+        required_processing = [task[1] for task in workflow]
+        required_bandwidth = [task[2] for task in workflow]
+        return self.place(processing, bandwidth, required_processing, required_bandwidth, start_node, rng)
+
+    def _candidates(self, cur_node, processing, bandwidth, required_processing, required_bandwidth, rng):
+        candidates = self.feasible_next_nodes(cur_node, processing, bandwidth, required_processing,
+                                              required_bandwidth)
+        self.stats.pruned += len(self.topology.neighbors(cur_node)) - len(candidates)
+        if rng is not None and len(candidates) > 1:
+            candidates = rng.permutation(candidates)
+        return candidates, 0
@@ -0,0 +1,182 @@
+import numpy as np
+
+from parameters import *
+
+UNREACHABLE_HOPS = np.iinfo(np.uint8).max  # hop 테이블에서 도달할 수 없는 노드 쌍의 값
+RELAXATION_ROUNDS = 8  # method="auto" 에서 반복 완화의 예상 반복 수
+
+
+class RoutingTable:
+    # 모든 노드 쌍의 최소 hop 수(uint8)와 최소 전송 지연(float32)을 저장하는 테이블
+    # hops[a, b], latency[a, b] 로 O(1) 에 조회 (도달 불가: UNREACHABLE_HOPS, inf)
+
+    def __init__(self, hops, latency):
+        self.hops = hops
+        self.latency = latency
+
+    @property
+    def num_nodes(self):
+        return len(self.hops)
+
+    def path_latency(self, path):  # 연속된 태스크 사이의 전송 지연 합
+        path = np.asarray(path)
+        return float(self.latency[path[:-1], path[1:]].sum())
+
+
+def link_latency(topology, bandwidth_capacity, transfer_data_size=TransferDataSize):
+    # CSR 순서의 링크별 전송 지연 = 전송 데이터 크기 / 두 노드 대역폭 중 작은 값
+    bandwidth_capacity = np.asarray(bandwidth_capacity, dtype=np.float64)
+    src = np.repeat(np.arange(topology.num_nodes), np.diff(topology.indptr))
+    bandwidth = np.minimum(bandwidth_capacity[src], bandwidth_capacity[topology.indices])
+    with np.errstate(divide="ignore"):
+        return np.where(bandwidth > 0, transfer_data_size / bandwidth, np.inf)
+
+
+def _dense_weights(topology, weights):
+    num_nodes = topology.num_nodes
+    dense = np.full((num_nodes, num_nodes), np.inf)
+    src = np.repeat(np.arange(num_nodes), np.diff(topology.indptr))
+    dense[src, topology.indices] = weights
+    np.fill_diagonal(dense, 0.0)
+    return dense
+
+
+def floyd_warshall(topology, weights):
+    # 밀집 행렬에 대한 벡터화된 Floyd-Warshall (노드 수가 적을 때 사용)
+    distance = _dense_weights(topology, weights)
+    for node in range(topology.num_nodes):
+        np.minimum(distance, distance[:, node, None] + distance[None, node, :], out=distance)
+    return distance
+
+
+def _reduce_starts(topology):
+    # reduceat 에 사용할 노드별 시작 위치와 이웃이 있는 노드 마스크
+    # 링크 배열 끝에 padding 열 하나를 붙여 사용하므로 이웃이 없는 마지막 노드들의 시작 위치(= 링크 수)도 유효하며,
+    # 마지막으로 이웃이 있는 노드의 구간이 링크 배열 끝까지 포함됨
+    has_neighbor = np.diff(topology.indptr) > 0
+    return topology.indptr[:-1], has_neighbor
+
+
+def bfs_from_sources(topology, sources):
+    # 희소 그래프에서 sources 들의 최소 hop 수를 한 번에 계산 (출발 노드별 BFS 를 frontier 행렬로 동시에 수행)
+    hops = np.full((len(sources), topology.num_nodes), UNREACHABLE_HOPS, dtype=np.uint8)
+    hops[np.arange(len(sources)), sources] = 0
+    if not len(topology.indices):
+        return hops
+    starts, has_neighbor = _reduce_starts(topology)
+    reached = hops == 0
+    frontier = reached
+    level = 0
+    while True:
+        padded = np.zeros((len(sources), len(topology.indices) + 1), dtype=bool)
+        padded[:, :-1] = frontier[:, topology.indices]
+        frontier = np.logical_or.reduceat(padded, starts, axis=1)
+        frontier[:, ~has_neighbor] = False
+        frontier &= ~reached
+        if not frontier.any():
+            return hops
+        level += 1
+        hops[frontier] = min(level, UNREACHABLE_HOPS - 1)
+        reached |= frontier
+
+
+def relax_from_sources(topology, weights, sources):
+    # 희소 그래프에서 sources 들의 최단 거리를 한 번에 계산 (벡터화된 Bellman-Ford 방식의 반복 완화)
+    # 각 반복에서 모든 노드 v 에 대해 min(이웃 u 의 거리 + w(u, v)) 를 reduceat 으로 계산
+    distance = np.full((len(sources), topology.num_nodes), np.inf, dtype=np.float32)
+    distance[np.arange(len(sources)), sources] = 0.0
+    if not len(topology.indices):
+        return distance
+    starts, has_neighbor = _reduce_starts(topology)
+    weights = np.asarray(weights, dtype=np.float32)
+    while True:
+        padded = np.full((len(sources), len(topology.indices) + 1), np.inf, dtype=np.float32)
+        padded[:, :-1] = distance[:, topology.indices] + weights[None, :]
+        through_neighbor = np.minimum.reduceat(padded, starts, axis=1)
+        through_neighbor[:, ~has_neighbor] = np.inf
+        updated = np.minimum(distance, through_neighbor)
+        if np.array_equal(updated, distance):
+            return distance
+        distance = updated
+
+
+def build_routing_table(topology, bandwidth_capacity, transfer_data_size=TransferDataSize, method="auto",
+                        max_batch_elements=1 << 24):
+    # method: "floyd_warshall", "relaxation" 또는 "auto"
+    # auto 는 노드 수가 RoutingFloydWarshallMaxNodes 이하이거나, 링크가 많아 반복 완화의 비용(노드 수 x 링크 수 x 반복 수)이
+    # Floyd-Warshall 의 비용(노드 수^3)보다 클 것으로 예상되는 밀집 그래프에서 Floyd-Warshall 을 사용
+    # relaxation 은 hop 수를 BFS 로, 전송 지연을 반복 완화로 계산하며 (출발 노드 수 x 링크 수) 중간 배열이 max_batch_elements 를 넘지 않도록 출발 노드를 나누어 계산
+    num_nodes = topology.num_nodes
+    if method == "auto":
+        dense = num_nodes * num_nodes <= RELAXATION_ROUNDS * len(topology.indices)
+        method = "floyd_warshall" if num_nodes <= RoutingFloydWarshallMaxNodes or dense else "relaxation"
+    latency_weights = link_latency(topology, bandwidth_capacity, transfer_data_size)
+
+    hops = np.empty((num_nodes, num_nodes), dtype=np.uint8)
+    latency = np.empty((num_nodes, num_nodes), dtype=np.float32)
+    if method == "floyd_warshall":
+        hop_distance = floyd_warshall(topology, np.ones(len(topology.indices)))
+        hops[...] = np.where(np.isfinite(hop_distance), np.minimum(hop_distance, UNREACHABLE_HOPS - 1),
+                             UNREACHABLE_HOPS)
+        latency[...] = floyd_warshall(topology, latency_weights)
+    elif method == "relaxation":
+        batch_size = max(1, max_batch_elements // max(len(topology.indices), 1))
+        for start in range(0, num_nodes, batch_size):
+            sources = np.arange(start, min(start + batch_size, num_nodes))
+            hops[sources] = bfs_from_sources(topology, sources)
+            latency[sources] = relax_from_sources(topology, latency_weights, sources)
+    else:
+        raise ValueError("unknown routing method: %s" % method)
+    return RoutingTable(hops, latency)
+
+
+class RoutedTopology:
+    # 연속된 태스크가 max_hops 이내의 노드에 배치될 수 있도록 routing 테이블로 이웃을 확장한 토폴로지
+    # max_hops 이내의 노드 목록은 생성할 때 한 번 CSR(indptr, indices) 로 만들어 두므로 neighbors() 는 Topology 와 같이 slice 만 함
+    # PlacementEngine, PathCache 가 사용하는 neighbors(), num_nodes, max_index 를 제공
+
+    def __init__(self, topology, routing, max_hops=MaxHopsBetweenTasks, max_batch_elements=1 << 24):
+        self.topology = topology
+        self.routing = routing
+        self.max_hops = max_hops
+        if max_hops <= 1:
+            self.indptr, self.indices = topology.indptr, topology.indices
+        else:
+            self.indptr, self.indices = k_hop_csr(routing.hops, max_hops, max_batch_elements,
+                                                 topology.indices.dtype)
+
+    @property
+    def num_nodes(self):
+        return self.topology.num_nodes
+
+    @property
+    def max_index(self):
+        return self.topology.max_index
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self, node=None):
+        if node is None:
+            return np.diff(self.indptr)
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def __getattr__(self, name):
+        return getattr(self.topology, name)
+
+
+def k_hop_csr(hops, max_hops, max_batch_elements=1 << 24, index_dtype=np.int32):
+    # hop 테이블에서 1 ~ max_hops hop 이내의 노드(0번 더미 노드 제외)를 CSR 로 변환 (행을 나누어 계산하여 메모리 사용량을 제한)
+    num_nodes = len(hops)
+    batch_size = max(1, max_batch_elements // max(num_nodes, 1))
+    counts = np.zeros(num_nodes, dtype=np.int64)
+    indices = []
+    for start in range(0, num_nodes, batch_size):
+        rows = hops[start:start + batch_size]
+        mask = (rows > 0) & (rows <= max_hops) & (rows < UNREACHABLE_HOPS)
+        mask[:, 0] = False
+        row_index, column_index = np.nonzero(mask)
+        counts[start:start + len(rows)] = np.bincount(row_index, minlength=len(rows))
+        indices.append(column_index.astype(index_dtype))
+    indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return indptr, np.concatenate(indices) if indices else np.zeros(0, dtype=index_dtype)
@@ -0,0 +1,364 @@
+import dataclasses
+
+import numpy as np
+
+from fitness import FitnessEvaluator
+from genetic import as_seed_sequence, run_genetic_algorithm, to_chromosome
+from instrumentation import Metrics, logger
+from parallel import ParallelExecutor
+from parameters import *
+from path_cache import PathCache
+from placement import PlacementEngine
+from routing import UNREACHABLE_HOPS, RoutedTopology, build_routing_table
+from topology import build_topology
+from workload import WorkflowTable
+
+
+@dataclasses.dataclass(frozen=True)
+class SimulationConfig:
+    # 하나의 시뮬레이션 시나리오의 파라미터 (기본 값은 parameters.py 의 값)
+    size_of_monitoring_area: int = SizeOfMonitoringArea
+    edge_server_area: int = EdgeServerArea
+    cloud_server_area: int = CloudServerArea
+    trans_range_of_drone: float = TransRangeOfDrone
+
+    num_of_drones: int = NumOfDrones
+    num_of_edge_servers: int = NumOfEdgeServer
+    num_of_cloud_servers: int = NumOfCloudServer
+
+    max_processing_rate_of_drone: int = MaxProcessingRateOfDrone
+    max_processing_rate_of_edge_server: int = MaxProcessingRateOfEdgeServer
+    max_processing_rate_of_cloud_server: int = MaxProcessingRateOfCloudServer
+    max_delay_factor_of_drone: float = MaxDelayFactorOfDrone
+    max_delay_factor_of_edge_server: float = MaxDelayFactorOfEdgeServer
+    max_delay_factor_of_cloud_server: float = MaxDelayFactorOfCloudServer
+    bandwidth_of_drone: int = BandwidthOfDrone
+    bandwidth_of_edge_server: int = BandwidthOfEdgeServer
+    bandwidth_of_cloud_server: int = BandwidthOfCloudServer
+
+    num_of_workflows: int = NumOfWorkflows
+    min_tasks_per_workflow: int = MinTasksPerWorkFlow
+    max_tasks_per_workflow: int = MaxTasksPerWorkflow
+    min_required_processing_power: int = MinRequiredProcessingPower
+    max_required_processing_power: int = MaxRequiredProcessingPower
+    min_required_bandwidth: int = MinRequiredBandwidth
+    max_required_bandwidth: int = MaxRequiredBandwidth
+
+    placement_expansion_budget: int = PlacementExpansionBudget
+    path_cache_size: int = PathCacheSize
+    path_cache_candidates: int = PathCacheCandidates
+    max_hops_between_tasks: int = MaxHopsBetweenTasks
+    transfer_data_size: float = TransferDataSize
+
+    population_size: int = PopulationSize
+    num_of_generations: int = NumOfGenerations
+    tournament_size: int = TournamentSize
+    crossover_rate: float = CrossoverRate
+    mutation_rate: float = MutationRate
+    num_of_elites: int = NumOfElites
+    convergence_patience: int = ConvergencePatience
+    ga_time_budget: float = GATimeBudget
+
+    fitness_weight_of_deployed: float = FitnessWeightOfDeployed
+    fitness_weight_of_processing: float = FitnessWeightOfProcessing
+    fitness_weight_of_bandwidth: float = FitnessWeightOfBandwidth
+    fitness_weight_of_delay: float = FitnessWeightOfDelay
+    fitness_weight_of_latency: float = FitnessWeightOfLatency
+
+    num_of_workers: int = NumOfWorkers
+
+    mobility_max_step: float = MobilityMaxStep
+    mobility_move_probability: float = MobilityMoveProbability
+    pending_retries_per_tick: int = PendingRetriesPerTick
+
+    def __post_init__(self):
+        # 자원이 0 이하인 노드는 어떤 태스크도 배치할 수 없고 GA 의 자원 복구가 끝나지 않으므로 거부
+        for name in CAPACITY_FIELDS:
+            if getattr(self, name) <= 0:
+                raise ValueError("%s must be positive (got %r)" % (name, getattr(self, name)))
+        # hop 테이블은 uint8 이고 UNREACHABLE_HOPS 가 도달 불가를 나타내므로 그보다 작은 hop 수만 표현 가능
+        if not 1 <= self.max_hops_between_tasks < UNREACHABLE_HOPS:
+            raise ValueError("max_hops_between_tasks must be between 1 and %d (got %r)"
+                             % (UNREACHABLE_HOPS - 1, self.max_hops_between_tasks))
+
+    @property
+    def max_matrix_index(self):
+        return self.num_of_drones + self.num_of_edge_servers + self.num_of_cloud_servers
+
+    @property
+    def uses_routing(self):  # 다중 hop 배치 또는 전송 지연 목적 함수에 라우팅 테이블이 필요한지 여부
+        return self.max_hops_between_tasks > 1 or self.fitness_weight_of_latency != 0
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+
+# 노드의 처리 능력, 대역폭을 결정하는 설정 필드 (양수여야 함)
+CAPACITY_FIELDS = (
+    "max_processing_rate_of_drone", "max_processing_rate_of_edge_server", "max_processing_rate_of_cloud_server",
+    "bandwidth_of_drone", "bandwidth_of_edge_server", "bandwidth_of_cloud_server",
+)
+
+# 시나리오(노드 위치, 토폴로지, 노드별 자원, 워크플로우, routing 테이블)를 결정하는 설정 필드
+# 이미 만들어진 시나리오(예: 스냅샷)에 대해서는 변경할 수 없고, 나머지 필드(GA, 배치, 실행 파라미터)만 변경 가능
+SCENARIO_FIELDS = (
+    "size_of_monitoring_area", "edge_server_area", "cloud_server_area", "trans_range_of_drone",
+    "num_of_drones", "num_of_edge_servers", "num_of_cloud_servers",
+    "max_processing_rate_of_drone", "max_processing_rate_of_edge_server", "max_processing_rate_of_cloud_server",
+    "max_delay_factor_of_drone", "max_delay_factor_of_edge_server", "max_delay_factor_of_cloud_server",
+    "bandwidth_of_drone", "bandwidth_of_edge_server", "bandwidth_of_cloud_server",
+    "num_of_workflows", "min_tasks_per_workflow", "max_tasks_per_workflow",
+    "min_required_processing_power", "max_required_processing_power", "min_required_bandwidth",
+    "max_required_bandwidth", "transfer_data_size",
+)
+
+
+class Scenario:
+    # 시나리오 한 개의 상태 (노드 위치, 토폴로지, 노드별 자원, 워크플로우)
+    # 노드 번호는 1부터 시작하며 각 배열의 0번 항목은 더미 노드
+    # routing 은 config.uses_routing 인 경우에만 생성되는 routing.RoutingTable (아니면 None)
+    # snapshot_path 는 snapshot.load_scenario 로 불러온 경우 그 파일 경로 (배열들은 읽기 전용 memory map)
+
+    def __init__(self, config, topology, processing_capacity, bandwidth_capacity, delay_factor, workflow_table,
+                 routing=None, snapshot_path=None):
+        self.config = config
+        self.topology = topology
+        self.processing_capacity = processing_capacity
+        self.bandwidth_capacity = bandwidth_capacity
+        self.delay_factor = delay_factor
+        self.workflow_table = workflow_table
+        self.routing = routing
+        self.snapshot_path = snapshot_path
+
+    @property
+    def x_positions(self):
+        return self.topology.x_positions
+
+    @property
+    def y_positions(self):
+        return self.topology.y_positions
+
+    @property
+    def workflow_info(self):  # 기존 WorkflowInfo 형태 [0, [(태스크 번호, 프로세싱 요구량, 대역폭 요구량), ...], ...]
+        workflow_info = [0, ]
+        for index in range(self.workflow_table.num_workflows):
+            required_processing, required_bandwidth = self.workflow_table.workflow(index)
+            workflow_info.append([(task + 1, int(required_processing[task]), int(required_bandwidth[task]))
+                                  for task in range(len(required_processing))])
+        return workflow_info
+
+
+class SimulationResult:
+
+    def __init__(self, config, seed, scenario, ga_result, fitness_evaluator, metrics=None):
+        self.config = config
+        self.seed = seed
+        self.scenario = scenario
+        self.ga_result = ga_result
+        self.fitness_evaluator = fitness_evaluator
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    @property
+    def timings(self):  # 단계별 실행 시간(초)
+        return self.metrics.phases
+
+    @property
+    def population(self):
+        return self.ga_result.population
+
+    @property
+    def best_index(self):
+        return self.ga_result.best_index
+
+    def best_chromosome(self):
+        return to_chromosome(self.population, self.best_index, self.scenario.workflow_table,
+                             self.scenario.delay_factor)
+
+    def best_paths(self):  # 최고 개체에서 배치된 워크플로우들의 경로 리스트
+        table = self.scenario.workflow_table
+        placements = self.population.placements[self.best_index]
+        deployed = self.population.deployed[self.best_index]
+        return [placements[workflow, :table.num_tasks[workflow]].tolist()
+                for workflow in range(table.num_workflows) if deployed[workflow]]
+
+    def best_components(self):
+        index = slice(self.best_index, self.best_index + 1)
+        components = self.fitness_evaluator.components(self.population.placements[index],
+                                                       self.population.deployed[index])
+        return {name: float(values[0]) for name, values in components.items()}
+
+    def summary(self):
+        summary = {"seed": self.seed, "generations": self.ga_result.generations,
+                   "stop_reason": self.ga_result.stop_reason, "best_fitness": self.ga_result.best_fitness}
+        summary.update(self.best_components())
+        summary["processing_utilization"] = summary["processing"] / float(self.scenario.processing_capacity.sum())
+        summary["bandwidth_utilization"] = summary["bandwidth"] / float(self.scenario.bandwidth_capacity.sum())
+        return summary
+
+
+def deploy_drone_edge_cloud(config, rng):  # Drone, 에지 서버, 클라우드 서버를 각 영역에 배치 (0번은 더미 노드)
+    area = config.size_of_monitoring_area
+    edge_area = config.edge_server_area
+    cloud_area = config.cloud_server_area
+    x_positions = np.concatenate(([0],
+                                  rng.integers(1, area + 1, config.num_of_drones),
+                                  rng.integers(area + 1, area + edge_area + 1, config.num_of_edge_servers),
+                                  rng.integers(area + edge_area + 1, area + edge_area + cloud_area + 1,
+                                               config.num_of_cloud_servers)))
+    y_positions = np.concatenate(([0], rng.integers(1, area + 1, config.max_matrix_index)))
+    logger.debug("Deployed %d nodes (including dummy node 0)", config.max_matrix_index + 1)
+    return x_positions, y_positions
+
+
+def update_connection_info(config, x_positions, y_positions):  # 네트워크 연결 정보 설정(드론, 에지 서버, 클라우드 서버)
+    topology = build_topology(x_positions, y_positions, config.num_of_drones, config.num_of_edge_servers,
+                              config.num_of_cloud_servers, config.trans_range_of_drone)
+    drone_src, drone_dst = topology.drone_links()
+    logger.debug("The Number of Total Connection %d", len(drone_src))
+    return topology
+
+
+def _per_node_values(config, drone_value, edge_server_value, cloud_server_value, dtype):
+    return np.concatenate(([0],
+                           np.full(config.num_of_drones, drone_value),
+                           np.full(config.num_of_edge_servers, edge_server_value),
+                           np.full(config.num_of_cloud_servers, cloud_server_value))).astype(dtype)
+
+
+def alloc_processing_power(config):  # 프로세싱 파워 초기화
+    return _per_node_values(config, config.max_processing_rate_of_drone, config.max_processing_rate_of_edge_server,
+                            config.max_processing_rate_of_cloud_server, np.int64)
+
+
+def alloc_delay_factor(config):  # 딜레이 factor 초기화
+    return _per_node_values(config, config.max_delay_factor_of_drone, config.max_delay_factor_of_edge_server,
+                            config.max_delay_factor_of_cloud_server, np.float64)
+
+
+def alloc_bandwidth(config):  # 대역폭 초기화
+    return _per_node_values(config, config.bandwidth_of_drone, config.bandwidth_of_edge_server,
+                            config.bandwidth_of_cloud_server, np.int64)
+
+
+def make_workflows(config, rng):  # workflow 생성 (태스크 수와 태스크별 요구량을 배열로 한 번에 생성)
+    num_tasks = rng.integers(config.min_tasks_per_workflow, config.max_tasks_per_workflow + 1,
+                             config.num_of_workflows).astype(np.int64)
+    shape = (config.num_of_workflows, config.max_tasks_per_workflow)
+    task_mask = np.arange(config.max_tasks_per_workflow)[None, :] < num_tasks[:, None]
+    processing = rng.integers(config.min_required_processing_power, config.max_required_processing_power + 1,
+                              shape) * task_mask
+    bandwidth = rng.integers(config.min_required_bandwidth, config.max_required_bandwidth + 1, shape) * task_mask
+    return WorkflowTable(num_tasks, processing.astype(np.int64), bandwidth.astype(np.int64))
+
+
+def build_scenario(config, seed=None, metrics=None):
+    # metrics 에 Metrics 를 전달하면 단계별(deploy, connect, resources, workflows, routing) 실행 시간(초)을 기록
+    if metrics is None:
+        metrics = Metrics()
+    rng = np.random.default_rng(seed)
+    with metrics.phase("deploy"):  # 드론(UAV), 에지, 클라우드를 모니터링 대상 영역에 배치
+        x_positions, y_positions = deploy_drone_edge_cloud(config, rng)
+    with metrics.phase("connect"):  # 드론간, 드론-에지, 에지-클라우드 토폴로지 생성
+        topology = update_connection_info(config, x_positions, y_positions)
+    with metrics.phase("resources"):  # 드론, 에지 서버, 클라우드 서버의 프로세싱 rate, bandwidth, 딜레이 factor 초기화
+        processing_capacity = alloc_processing_power(config)
+        bandwidth_capacity = alloc_bandwidth(config)
+        delay_factor = alloc_delay_factor(config)
+    with metrics.phase("workflows"):  # workflow 를 생성
+        workflow_table = make_workflows(config, rng)
+    routing = None
+    if config.uses_routing:
+        with metrics.phase("routing"):  # 모든 노드 쌍의 최소 hop 수와 전송 지연 테이블을 미리 계산
+            routing = build_routing_table(topology, bandwidth_capacity, config.transfer_data_size)
+    return Scenario(config, topology, processing_capacity, bandwidth_capacity, delay_factor, workflow_table,
+                    routing)
+
+
+def fitness_evaluator_of(config, scenario):
+    return FitnessEvaluator(scenario.workflow_table, scenario.delay_factor,
+                            config.fitness_weight_of_deployed, config.fitness_weight_of_processing,
+                            config.fitness_weight_of_bandwidth, config.fitness_weight_of_delay,
+                            config.fitness_weight_of_latency,
+                            scenario.routing.latency if scenario.routing is not None else None)
+
+
+def make_placer(config, topology, routing=None):
+    # 배치 엔진 (path_cache_size > 0 이면 후보 경로 캐시를 앞에 둠)
+    # routing 이 주어지고 max_hops_between_tasks > 1 이면 연속된 태스크를 그 hop 수 이내의 노드에 배치
+    if routing is not None and config.max_hops_between_tasks > 1:
+        topology = RoutedTopology(topology, routing, config.max_hops_between_tasks)
+    engine = PlacementEngine(topology, config.placement_expansion_budget)
+    if config.path_cache_size > 0:
+        return PathCache(engine, config.path_cache_size, config.path_cache_candidates,
+                         config.placement_expansion_budget)
+    return engine
+
+
+def optimize(config, scenario, seed=None, metrics=None):
+    # 주어진 시나리오에 대해 population 을 생성하고 유전 알고리즘을 수행
+    # metrics 에는 population_init, fitness, evolution 실행 시간과 배치 탐색 카운터를 기록
+    if metrics is None:
+        metrics = Metrics()
+    engine = make_placer(config, scenario.topology, scenario.routing)
+    evaluator = fitness_evaluator_of(config, scenario)
+    ga_options = dict(population_size=config.population_size, num_of_generations=config.num_of_generations,
+                      tournament_size=config.tournament_size, crossover_rate=config.crossover_rate,
+                      mutation_rate=config.mutation_rate, num_of_elites=config.num_of_elites,
+                      patience=config.convergence_patience, time_budget=config.ga_time_budget, seed=seed)
+    if config.num_of_workers == 1:
+        ga_result = run_genetic_algorithm(engine, scenario.workflow_table, scenario.processing_capacity,
+                                          scenario.bandwidth_capacity, fitness_function=evaluator, **ga_options)
+    else:  # 공유 메모리에 토폴로지/자원/워크플로우를 게시하고 프로세스 풀에서 초기화 및 fitness 계산
+        with ParallelExecutor(scenario.topology, scenario.workflow_table, scenario.processing_capacity,
+                              scenario.bandwidth_capacity, scenario.delay_factor, config.population_size,
+                              num_workers=config.num_of_workers, max_expansions=config.placement_expansion_budget,
+                              fitness_evaluator=evaluator, path_cache_size=config.path_cache_size,
+                              path_cache_candidates=config.path_cache_candidates, routing=scenario.routing,
+                              max_hops_between_tasks=config.max_hops_between_tasks,
+                              snapshot_path=scenario.snapshot_path) as executor:
+            ga_result = run_genetic_algorithm(engine, scenario.workflow_table, scenario.processing_capacity,
+                                              scenario.bandwidth_capacity, fitness_function=executor.evaluate,
+                                              population_initializer=executor.initialize_population, **ga_options)
+        engine.stats.add(executor.placement_stats.as_dict())
+        if isinstance(engine, PathCache):
+            engine.cache_stats.add(executor.path_cache_stats.as_dict())
+    logger.info("Generations: %d, Stop reason: %s, Best fitness: %s", ga_result.generations, ga_result.stop_reason,
+                ga_result.best_fitness)
+
+    for name, seconds in ga_result.timings.items():
+        metrics.add_time(name, seconds)
+    for name, value in engine.stats.as_dict().items():
+        metrics.count("placement_" + name, value)
+    if isinstance(engine, PathCache):
+        for name, value in engine.cache_stats.as_dict().items():
+            metrics.count("path_cache_" + name, value)
+    metrics.count("generations", ga_result.generations)
+    metrics.set("stop_reason", ga_result.stop_reason)
+    metrics.set("initial_failed_workflows_per_chromosome", ga_result.initial_failed_workflows.tolist())
+    metrics.set("failed_workflows_per_chromosome",
+                (~ga_result.population.deployed).sum(axis=1).tolist())
+    return ga_result, evaluator
+
+
+def run(config=None, seed=None, profile=False, profile_path=None, scenario=None):
+    # 하나의 시나리오를 생성하고 최적화까지 수행. 모든 상태는 반환되는 SimulationResult 가 소유하므로
+    # 같은 프로세스에서 여러 시나리오를 연속 또는 동시에 수행할 수 있음
+    # profile 이 True 이거나 profile_path 를 지정하면 cProfile 결과를 metrics 에 포함 (profile_path 에는 pstats 파일 저장)
+    # scenario 를 전달하면 (예: snapshot.load_scenario) 시나리오를 생성하지 않고 그 시나리오에서 최적화만 수행
+    if config is None:
+        config = scenario.config if scenario is not None else SimulationConfig()
+    if scenario is not None:
+        changed = [name for name in SCENARIO_FIELDS if getattr(config, name) != getattr(scenario.config, name)]
+        if changed:
+            raise ValueError("config does not match the scenario: %s" % ", ".join(changed))
+    metrics = Metrics(profile=profile, profile_path=profile_path)
+    scenario_seed, ga_seed = as_seed_sequence(seed).spawn(2)
+    with metrics.profile():
+        if scenario is None:
+            scenario = build_scenario(config, scenario_seed, metrics)
+        elif config.uses_routing and scenario.routing is None:
+            with metrics.phase("routing"):
+                scenario.routing = build_routing_table(scenario.topology, scenario.bandwidth_capacity,
+                                                       config.transfer_data_size)
+        ga_result, evaluator = optimize(config, scenario, ga_seed, metrics)
+    return SimulationResult(config, seed, scenario, ga_result, evaluator, metrics)
@@ -0,0 +1,115 @@
+import dataclasses
+import json
+import os
+import struct
+
+import numpy as np
+
+from routing import RoutingTable
+from simulation import Scenario, SimulationConfig
+from topology import Topology
+from workload import WorkflowTable
+
+# 파일 구조: MAGIC(8) | 버전(uint32) | 헤더 길이(uint32) | JSON 헤더 | 배열 데이터(각 배열은 ALIGNMENT 바이트 정렬)
+# JSON 헤더: {"config": SimulationConfig 필드, "node_counts": [드론, 에지, 클라우드], "arrays": {이름: [offset, dtype, shape]}}
+# 배열 이름은 parallel.ParallelExecutor 의 공유 배열 이름과 같음
+MAGIC = b"TADSNAP\0"
+VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def scenario_arrays(scenario):  # 스냅샷에 저장하는 배열 (이름 -> 배열)
+    table = scenario.workflow_table
+    arrays = {
+        "x_positions": scenario.topology.x_positions,
+        "y_positions": scenario.topology.y_positions,
+        "indptr": scenario.topology.indptr,
+        "indices": scenario.topology.indices,
+        "processing_capacity": np.asarray(scenario.processing_capacity, dtype=np.int64),
+        "bandwidth_capacity": np.asarray(scenario.bandwidth_capacity, dtype=np.int64),
+        "delay_factor": np.asarray(scenario.delay_factor, dtype=np.float64),
+        "num_tasks": table.num_tasks,
+        "task_processing": table.processing,
+        "task_bandwidth": table.bandwidth,
+    }
+    if scenario.routing is not None:
+        arrays["routing_hops"] = scenario.routing.hops
+        arrays["routing_latency"] = scenario.routing.latency
+    return arrays
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_scenario(scenario, path):
+    # 시나리오 전체를 하나의 바이너리 파일로 저장 (임시 파일에 쓴 뒤 이름을 바꾸어 중간 상태의 파일을 남기지 않음)
+    arrays = {name: np.ascontiguousarray(array) for name, array in scenario_arrays(scenario).items()}
+    topology = scenario.topology
+    header = {"config": dataclasses.asdict(scenario.config),
+              "node_counts": [topology.num_drones, topology.num_edge_servers, topology.num_cloud_servers],
+              "arrays": {}}
+    # 헤더 길이가 offset 에 따라 바뀌므로 offset 이 고정될 때까지 반복
+    data_start = 0
+    while True:
+        offset = data_start
+        for name, array in arrays.items():
+            header["arrays"][name] = [offset, array.dtype.str, list(array.shape)]
+            offset = _aligned(offset + array.nbytes)
+        encoded = json.dumps(header).encode("utf-8")
+        required = _aligned(_PREAMBLE.size + len(encoded))
+        if required == data_start:
+            break
+        data_start = required
+
+    temp_path = "%s.tmp%d" % (path, os.getpid())
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(_PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+        snapshot_file.write(encoded)
+        for name, array in arrays.items():
+            snapshot_file.seek(header["arrays"][name][0])
+            snapshot_file.write(array.tobytes())
+        snapshot_file.truncate(max(offset, data_start))
+    os.replace(temp_path, path)
+    return path
+
+
+def read_header(path):
+    with open(path, "rb") as snapshot_file:
+        magic, version, header_length = _PREAMBLE.unpack(snapshot_file.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError("%s is not a scenario snapshot" % path)
+        if version > VERSION:
+            raise ValueError("unsupported snapshot version %d (supported: %d)" % (version, VERSION))
+        return json.loads(snapshot_file.read(header_length).decode("utf-8"))
+
+
+def map_arrays(path, header=None):
+    # 파일 전체를 읽기 전용으로 memory map 하여 배열별 view 를 반환 (데이터는 접근할 때 페이지 단위로 읽힘)
+    # 여러 프로세스가 같은 파일을 열면 OS 페이지 캐시를 공유하므로 복사가 일어나지 않음
+    if header is None:
+        header = read_header(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, (offset, dtype, shape) in header["arrays"].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = mapped[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+    return arrays
+
+
+def load_scenario(path):
+    header = read_header(path)
+    arrays = map_arrays(path, header)
+    fields = {field.name for field in dataclasses.fields(SimulationConfig)}
+    config = SimulationConfig(**{name: value for name, value in header["config"].items() if name in fields})
+    num_drones, num_edge_servers, num_cloud_servers = header["node_counts"]
+    topology = Topology(arrays["x_positions"], arrays["y_positions"], num_drones, num_edge_servers,
+                        num_cloud_servers, arrays["indptr"], arrays["indices"])
+    table = WorkflowTable(arrays["num_tasks"], arrays["task_processing"], arrays["task_bandwidth"])
+    routing = None
+    if "routing_hops" in arrays:
+        routing = RoutingTable(arrays["routing_hops"], arrays["routing_latency"])
+    return Scenario(config, topology, arrays["processing_capacity"], arrays["bandwidth_capacity"],
+                    arrays["delay_factor"], table, routing, snapshot_path=os.path.abspath(path))
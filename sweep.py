@@ -0,0 +1,220 @@
+import argparse
+import concurrent.futures
+import dataclasses
+import glob
+import itertools
+import os
+
+import numpy as np
+
+from instrumentation import configure_logging, logger
+from simulation import SimulationConfig, run
+
+PART_FILE_PATTERN = "part-%06d.npz"  # 결과 파일 이름 (append-only, 완료된 chunk 마다 하나씩 생성)
+
+TIMING_COLUMNS = (  # 시나리오마다 time_<이름> 컬럼으로 기록하는 단계별 실행 시간
+    "deploy", "connect", "resources", "workflows", "routing", "population_init", "fitness", "evolution")
+
+
+def grid_design(axes, seeds):
+    # axes: {파라미터 이름: 값 리스트}, seeds: 시드 리스트
+    # 모든 조합 x 시드를 (scenario_id, {파라미터: 값}, seed) 로 순서대로 생성
+    names = sorted(axes)
+    scenario_id = 0
+    for values in itertools.product(*(axes[name] for name in names)):
+        for seed in seeds:
+            yield scenario_id, dict(zip(names, values)), int(seed)
+            scenario_id += 1
+
+
+def random_design(ranges, num_of_scenarios, design_seed=0):
+    # ranges: {파라미터 이름: (최소, 최대) 또는 값 리스트}
+    # 각 시나리오는 (design_seed, scenario_id) 로 정해지는 RNG 로 뽑으므로 중간부터 다시 생성해도 같은 값을 얻음
+    names = sorted(ranges)
+    for scenario_id in range(num_of_scenarios):
+        rng = np.random.default_rng([design_seed, scenario_id])
+        overrides = {}
+        for name in names:
+            candidates = ranges[name]
+            if isinstance(candidates, tuple):
+                low, high = candidates
+                if isinstance(low, int) and isinstance(high, int):
+                    overrides[name] = int(rng.integers(low, high + 1))
+                else:
+                    overrides[name] = float(rng.uniform(low, high))
+            else:
+                overrides[name] = candidates[int(rng.integers(len(candidates)))]
+        yield scenario_id, overrides, int(rng.integers(2 ** 31))
+
+
+def run_scenario(base_config, scenario_id, overrides, seed):
+    # 작업 프로세스에서 시나리오 하나를 수행하고 결과 한 행을 dict 로 반환
+    config = base_config.replace(**overrides)
+    result = run(config, seed)
+    row = result.summary()
+    row["scenario_id"] = scenario_id
+    row.update(overrides)
+    for name in TIMING_COLUMNS:
+        row["time_" + name] = result.timings.get(name, 0.0)
+    return row
+
+
+def completed_scenarios(output_dir):
+    # 이미 기록된 part 파일들의 scenario_id 집합 (scenario_id 컬럼만 읽음)
+    done = set()
+    for path in sorted(glob.glob(os.path.join(output_dir, "part-*.npz"))):
+        with np.load(path, allow_pickle=False) as part:
+            done.update(part["scenario_id"].tolist())
+    return done
+
+
+def _next_part_index(output_dir):
+    indices = [int(os.path.basename(path)[5:11]) for path in glob.glob(os.path.join(output_dir, "part-*.npz"))]
+    return max(indices) + 1 if indices else 0
+
+
+def write_part(output_dir, part_index, rows):
+    # rows 를 컬럼 단위 배열로 변환하여 임시 파일에 쓴 뒤 rename (중단되어도 완성된 part 파일만 남음)
+    columns = {}
+    for name in rows[0]:
+        values = [row[name] for row in rows]
+        columns[name] = np.asarray(values, dtype=str if isinstance(values[0], str) else None)
+    path = os.path.join(output_dir, PART_FILE_PATTERN % part_index)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as part_file:
+        np.savez(part_file, **columns)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_results(output_dir, columns=None):
+    # 모든 part 파일을 읽어 {컬럼 이름: 배열} 로 합침
+    parts = {}
+    for path in sorted(glob.glob(os.path.join(output_dir, "part-*.npz"))):
+        with np.load(path, allow_pickle=False) as part:
+            for name in (columns or part.files):
+                parts.setdefault(name, []).append(part[name])
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+class PartWriter:
+    # 완료된 행을 모아 chunk_size 행마다 새 part 파일로 기록
+
+    def __init__(self, output_dir, chunk_size):
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.part_index = _next_part_index(output_dir)
+        self.rows = []
+
+    def append(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            write_part(self.output_dir, self.part_index, self.rows)
+            self.part_index += 1
+            self.rows = []
+
+
+def run_sweep(design, output_dir, base_config=None, num_workers=None, chunk_size=256, max_in_flight=None):
+    # design 의 시나리오들을 프로세스 풀에서 수행하고, 완료되는 순서대로 chunk_size 행씩 part 파일에 기록
+    # 이미 기록된 scenario_id 는 건너뛰므로 중단된 스윕을 같은 design 으로 다시 실행하면 이어서 수행
+    # 동시에 제출하는 작업 수(max_in_flight)와 버퍼(chunk_size)로 메모리 사용량을 제한
+    # 실패한 시나리오는 오류 로그를 남기고 건너뛰며 (다시 실행하면 재시도), 중단되거나 예외가 발생해도 완료된 행은 기록
+    # (완료된 시나리오 수, 실패한 시나리오 수) 를 반환
+    if base_config is None:
+        base_config = SimulationConfig()
+    if base_config.num_of_workers != 1:  # 스윕은 시나리오 단위로 병렬 수행
+        base_config = base_config.replace(num_of_workers=1)
+    os.makedirs(output_dir, exist_ok=True)
+    done = completed_scenarios(output_dir)
+    writer = PartWriter(output_dir, chunk_size)
+    num_workers = num_workers or os.cpu_count()
+    max_in_flight = max_in_flight or num_workers * 4
+
+    num_of_completed = 0
+    num_of_failed = 0
+    pending = {}  # future -> scenario_id
+
+    def collect(future):
+        nonlocal num_of_completed, num_of_failed
+        scenario_id = pending.pop(future)
+        try:
+            row = future.result()
+        except Exception:
+            logger.exception("Scenario %d failed", scenario_id)
+            num_of_failed += 1
+            return
+        writer.append(row)
+        num_of_completed += 1
+
+    with concurrent.futures.ProcessPoolExecutor(num_workers) as executor:
+        try:
+            for scenario_id, overrides, seed in design:
+                if scenario_id in done:
+                    continue
+                while len(pending) >= max_in_flight:
+                    finished, _ = concurrent.futures.wait(list(pending),
+                                                          return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future)
+                pending[executor.submit(run_scenario, base_config, scenario_id, overrides, seed)] = scenario_id
+            for future in concurrent.futures.as_completed(list(pending)):
+                collect(future)
+        finally:  # 중단된 경우에도 이미 끝난 시나리오의 행은 기록하고 남은 작업은 취소
+            for future in [future for future in pending if future.done()]:
+                collect(future)
+            writer.flush()
+            for future in pending:
+                future.cancel()
+    return num_of_completed, num_of_failed
+
+
+def _parse_value(name, text):
+    field_type = {field.name: field.type for field in dataclasses.fields(SimulationConfig)}[name]
+    return float(text) if field_type in (float, "float") else int(text)
+
+
+def _parse_axes(items, separator):
+    # "num_of_drones=30,100" (grid) 또는 "num_of_drones=30:300" (random 범위)
+    axes = {}
+    for item in items:
+        name, text = item.split("=", 1)
+        if separator == ":" and ":" in text:
+            low, high = text.split(":", 1)
+            axes[name] = (_parse_value(name, low), _parse_value(name, high))
+        else:
+            axes[name] = [_parse_value(name, value) for value in text.split(",")]
+    return axes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo parameter sweep")
+    parser.add_argument("--output", required=True, help="결과 part 파일을 저장할 디렉터리")
+    parser.add_argument("--grid", nargs="*", default=[], help="이름=값1,값2,... (모든 조합을 수행)")
+    parser.add_argument("--random", nargs="*", default=[], help="이름=최소:최대 또는 이름=값1,값2,... (무작위 추출)")
+    parser.add_argument("--samples", type=int, default=100, help="random design 의 시나리오 수")
+    parser.add_argument("--seeds", type=int, default=10, help="grid design 에서 조합마다 수행할 시드 수")
+    parser.add_argument("--design-seed", type=int, default=0, help="random design 의 시드")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="part 파일 하나에 기록하는 행 수")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="로그 출력 (-v: INFO, -vv: DEBUG)")
+    arguments = parser.parse_args(argv)
+    configure_logging(arguments.verbose)  # 실패한 시나리오의 오류는 기본 설정에서도 출력
+
+    if arguments.random:
+        design = random_design(_parse_axes(arguments.random, ":"), arguments.samples, arguments.design_seed)
+    else:
+        design = grid_design(_parse_axes(arguments.grid, ","), range(arguments.seeds))
+    num_of_completed, num_of_failed = run_sweep(design, arguments.output, num_workers=arguments.workers,
+                                                chunk_size=arguments.chunk_size)
+    print("completed scenarios:", num_of_completed)
+    print("failed scenarios:", num_of_failed)
+    if num_of_failed:
+        raise SystemExit("error: %d scenarios failed" % num_of_failed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from genetic import empty_population, repair_capacity
+from simulation import SimulationConfig, build_scenario, run
+
+
+def test_best_fitness_improves_on_constrained_scenario():
+    # 자원이 부족하여 초기 population 에서 일부 워크플로우가 배치되지 못하는 시나리오
+    config = SimulationConfig(num_of_drones=100, num_of_workflows=150)
+    result = run(config, 4)
+    history = result.ga_result.history
+    assert result.ga_result.initial_failed_workflows.min() > 0
+    assert history[-1] > history[0] + 5  # 배치 수 기준으로 워크플로우 5개 이상 개선
+    assert np.all(np.diff(history) >= 0)  # elite 가 있으므로 세대별 최고 fitness 는 감소하지 않음
+
+
+def test_children_do_not_degrade_without_elites():
+    # elite 없이도 crossover + repair 로 만든 자식 세대가 초기 population 보다 나빠지지 않아야 함
+    config = SimulationConfig(num_of_drones=100, num_of_workflows=150, num_of_elites=0)
+    history = run(config, 4).ga_result.history
+    assert history[-1] > history[0]
+
+
+def test_repair_capacity_stops_on_unused_node_without_capacity():
+    # 자원이 0 인 노드를 사용하는 워크플로우가 없으면 제거할 워크플로우가 없으므로 바로 끝나야 함
+    scenario = build_scenario(SimulationConfig(num_of_drones=50), 1)
+    processing_capacity = np.array(scenario.processing_capacity, dtype=np.int64)
+    processing_capacity[-1] = 0
+    population = empty_population(2, scenario.workflow_table, processing_capacity, scenario.bandwidth_capacity)
+    dropped = repair_capacity(population, scenario.workflow_table, np.random.default_rng(0))
+    assert not dropped.any()
+
+
+def test_config_rejects_non_positive_capacity():
+    with pytest.raises(ValueError):
+        SimulationConfig(bandwidth_of_cloud_server=0)
+    with pytest.raises(ValueError):
+        SimulationConfig().replace(max_processing_rate_of_drone=-1)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from routing import UNREACHABLE_HOPS, build_routing_table, k_hop_csr
+from simulation import SimulationConfig, build_scenario
+
+
+def test_relaxation_matches_floyd_warshall_with_isolated_trailing_nodes():
+    # 에지 서버가 없고 전송 범위가 작아 CSR 의 마지막 노드들이 고립된 시나리오 (reduceat 구간 경계 확인)
+    config = SimulationConfig(num_of_drones=800, num_of_edge_servers=0, trans_range_of_drone=5,
+                              max_hops_between_tasks=2)
+    scenario = build_scenario(config, 1)
+    topology = scenario.topology
+    assert np.diff(topology.indptr)[-1] == 0
+    expected = build_routing_table(topology, scenario.bandwidth_capacity, method="floyd_warshall")
+    for max_batch_elements in (1, 1000, 1 << 24):
+        actual = build_routing_table(topology, scenario.bandwidth_capacity, method="relaxation",
+                                     max_batch_elements=max_batch_elements)
+        np.testing.assert_array_equal(actual.hops, expected.hops)
+        np.testing.assert_allclose(actual.latency, expected.latency, rtol=1e-5)
+
+
+def test_k_hop_csr_excludes_unreachable_nodes():
+    # max_hops 가 UNREACHABLE_HOPS 이상이어도 도달할 수 없는 노드는 이웃에 포함되지 않아야 함
+    hops = np.array([[0, UNREACHABLE_HOPS, UNREACHABLE_HOPS],
+                     [UNREACHABLE_HOPS, 0, UNREACHABLE_HOPS],
+                     [UNREACHABLE_HOPS, UNREACHABLE_HOPS, 0]], dtype=np.uint8)
+    hops[1, 2] = hops[2, 1] = 1
+    indptr, indices = k_hop_csr(hops, UNREACHABLE_HOPS)
+    np.testing.assert_array_equal(indptr, [0, 0, 1, 2])
+    np.testing.assert_array_equal(indices, [2, 1])
+
+
+def test_config_rejects_max_hops_out_of_range():
+    for max_hops in (0, UNREACHABLE_HOPS):
+        with pytest.raises(ValueError):
+            SimulationConfig(max_hops_between_tasks=max_hops)
+    SimulationConfig(max_hops_between_tasks=UNREACHABLE_HOPS - 1)
@@ -0,0 +1,9 @@
+from sweep import grid_design, run_sweep
+
+
+def test_failed_scenarios_are_counted(tmp_path):
+    # 잘못된 파라미터로 실패한 시나리오는 기록되지 않고 실패 수로 반환되어야 함
+    design = list(grid_design({"num_of_drones": [30, -5]}, range(1)))
+    assert run_sweep(design, str(tmp_path), num_workers=2) == (1, 1)
+    # 다시 실행하면 완료된 시나리오는 건너뛰고 실패한 시나리오만 재시도
+    assert run_sweep(design, str(tmp_path), num_workers=2) == (0, 1)
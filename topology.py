@@ -0,0 +1,187 @@
+import numpy as np
+
+
+# 드론 간 이웃 탐색에 사용하는 그리드 셀의 (dx, dy) 오프셋
+# 자기 자신 셀과 절반의 이웃 셀만 검사하여 같은 쌍을 두 번 비교하지 않음
+_HALF_NEIGHBOR_CELLS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class Topology:
+    # 드론, 에지 서버, 클라우드 서버의 연결 정보를 CSR(indptr, indices) 형태로 저장
+    # 노드 번호는 기존 코드와 동일하게 1부터 시작하며, 0번은 연결이 없는 더미 노드
+
+    def __init__(self, x_positions, y_positions, num_drones, num_edge_servers, num_cloud_servers, indptr, indices):
+        self.x_positions = x_positions
+        self.y_positions = y_positions
+        self.num_drones = num_drones
+        self.num_edge_servers = num_edge_servers
+        self.num_cloud_servers = num_cloud_servers
+        self.max_index = num_drones + num_edge_servers + num_cloud_servers
+        self.indptr = indptr
+        self.indices = indices
+
+    @property
+    def num_nodes(self):
+        return self.max_index + 1
+
+    @property
+    def num_links(self):  # 양방향 링크 수
+        return len(self.indices) // 2
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self, node=None):
+        if node is None:
+            return np.diff(self.indptr)
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def has_link(self, node1, node2):
+        row = self.neighbors(node1)
+        pos = np.searchsorted(row, node2)
+        return bool(pos < len(row) and row[pos] == node2)
+
+    def links(self):  # (node1 < node2) 인 링크 목록을 두 배열로 반환
+        src = np.repeat(np.arange(self.num_nodes, dtype=self.indices.dtype), np.diff(self.indptr))
+        mask = src < self.indices
+        return src[mask], self.indices[mask]
+
+    def drone_links(self):
+        src, dst = self.links()
+        mask = dst <= self.num_drones
+        return src[mask], dst[mask]
+
+    def as_connection_info(self):
+        return ConnectionInfoView(self)
+
+
+class ConnectionInfoView:
+    # 기존 할당 코드가 ConnectionInfo[index1][index2] 형태로 읽을 수 있도록 하는 어댑터
+
+    def __init__(self, topology):
+        self.topology = topology
+
+    def __len__(self):
+        return self.topology.num_nodes
+
+    def __getitem__(self, node):
+        if node < 0 or node >= self.topology.num_nodes:
+            raise IndexError(node)
+        return _ConnectionRow(self.topology.neighbors(node))
+
+    def to_dense(self):  # 작은 토폴로지의 출력/디버깅을 위한 밀집 행렬(list of lists) 생성
+        num_nodes = self.topology.num_nodes
+        dense = np.zeros((num_nodes, num_nodes), dtype=np.int8)
+        src = np.repeat(np.arange(num_nodes), np.diff(self.topology.indptr))
+        dense[src, self.topology.indices] = 1
+        return dense.tolist()
+
+
+class _ConnectionRow:
+
+    def __init__(self, row):
+        self.row = row
+
+    def __getitem__(self, node):
+        pos = np.searchsorted(self.row, node)
+        return 1 if pos < len(self.row) and self.row[pos] == node else 0
+
+
+def find_drone_pairs(x_positions, y_positions, trans_range):
+    # 그리드(셀 크기 = 통신 반경) 인덱스를 이용하여 통신 반경 내의 드론 쌍을 탐색
+    # 입력 배열은 0부터 시작하는 드론 좌표이며, 반환 값도 0부터 시작하는 인덱스 쌍 (i < j)
+    x_positions = np.asarray(x_positions, dtype=np.float64)
+    y_positions = np.asarray(y_positions, dtype=np.float64)
+    num_drones = len(x_positions)
+    empty = np.empty(0, dtype=np.int64)
+    if num_drones < 2 or trans_range < 0:
+        return empty, empty
+
+    cell_size = float(trans_range) if trans_range > 0 else 1.0
+    cell_x = np.floor((x_positions - x_positions.min()) / cell_size).astype(np.int64)
+    cell_y = np.floor((y_positions - y_positions.min()) / cell_size).astype(np.int64)
+    num_cell_y = int(cell_y.max()) + 2
+    cell_id = cell_x * num_cell_y + cell_y
+
+    order = np.argsort(cell_id, kind="stable")
+    sorted_cell_id = cell_id[order]
+    occupied, cell_start, cell_count = np.unique(sorted_cell_id, return_index=True, return_counts=True)
+    cell_lookup = {int(cid): (int(start), int(count)) for cid, start, count in zip(occupied, cell_start, cell_count)}
+
+    range_sq = float(trans_range) ** 2
+    src_parts = []
+    dst_parts = []
+    for cid, (start, count) in cell_lookup.items():
+        members = order[start:start + count]
+        cx, cy = divmod(cid, num_cell_y)
+        for dx, dy in _HALF_NEIGHBOR_CELLS:
+            if cy + dy < 0:
+                continue
+            other = cell_lookup.get((cx + dx) * num_cell_y + cy + dy)
+            if other is None:
+                continue
+            others = order[other[0]:other[0] + other[1]]
+            diff_x = x_positions[members][:, None] - x_positions[others][None, :]
+            diff_y = y_positions[members][:, None] - y_positions[others][None, :]
+            within = diff_x * diff_x + diff_y * diff_y <= range_sq
+            if dx == 0 and dy == 0:
+                within = np.triu(within, k=1)  # 같은 셀 안에서는 한 쌍을 한 번만 선택
+            rows, cols = np.nonzero(within)
+            src_parts.append(members[rows])
+            dst_parts.append(others[cols])
+
+    if not src_parts:
+        return empty, empty
+    src = np.concatenate(src_parts)
+    dst = np.concatenate(dst_parts)
+    return np.minimum(src, dst), np.maximum(src, dst)
+
+
+def build_topology(x_positions, y_positions, num_drones, num_edge_servers, num_cloud_servers, trans_range):
+    # x_positions, y_positions 는 기존 NodeXPositions 와 같이 0번 더미 노드를 포함한 배열
+    x_positions = np.asarray(x_positions, dtype=np.float64)
+    y_positions = np.asarray(y_positions, dtype=np.float64)
+    max_index = num_drones + num_edge_servers + num_cloud_servers
+    num_nodes = max_index + 1
+    index_dtype = np.int32 if num_nodes < np.iinfo(np.int32).max else np.int64
+
+    # 드론간 연결 (통신 반경 이내)
+    d2d_src, d2d_dst = find_drone_pairs(x_positions[1:num_drones + 1], y_positions[1:num_drones + 1], trans_range)
+    d2d_src = d2d_src + 1
+    d2d_dst = d2d_dst + 1
+
+    # 드론과 에지 서버간 연결 (4G, LTE 등과 같은 기법으로 1-Hop 통신이 가능하다고 가정)
+    drones = np.arange(1, num_drones + 1)
+    edge_servers = np.arange(num_drones + 1, num_drones + num_edge_servers + 1)
+    d2e_src = np.repeat(drones, len(edge_servers))
+    d2e_dst = np.tile(edge_servers, len(drones))
+
+    # 에지 서버와 클라우드 서버간 연결
+    cloud_servers = np.arange(num_drones + num_edge_servers + 1, max_index + 1)
+    e2c_src = np.repeat(edge_servers, len(cloud_servers))
+    e2c_dst = np.tile(cloud_servers, len(edge_servers))
+
+    src = np.concatenate((d2d_src, d2e_src, e2c_src))
+    dst = np.concatenate((d2d_dst, d2e_dst, e2c_dst))
+    return topology_from_links(x_positions, y_positions, num_drones, num_edge_servers, num_cloud_servers,
+                               src, dst, index_dtype)
+
+
+def topology_from_links(x_positions, y_positions, num_drones, num_edge_servers, num_cloud_servers, src, dst,
+                        index_dtype=np.int32):
+    # 한 방향 링크 목록(src, dst)을 양방향 CSR 로 변환
+    num_nodes = num_drones + num_edge_servers + num_cloud_servers + 1
+    both_src = np.concatenate((src, dst)).astype(index_dtype, copy=False)
+    both_dst = np.concatenate((dst, src)).astype(index_dtype, copy=False)
+    order = np.lexsort((both_dst, both_src))
+    both_src = both_src[order]
+    both_dst = both_dst[order]
+    if len(both_src) > 1:  # 중복 링크 제거
+        keep = np.ones(len(both_src), dtype=bool)
+        keep[1:] = (both_src[1:] != both_src[:-1]) | (both_dst[1:] != both_dst[:-1])
+        both_src = both_src[keep]
+        both_dst = both_dst[keep]
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(both_src, minlength=num_nodes), out=indptr[1:])
+    return Topology(np.asarray(x_positions, dtype=np.float64), np.asarray(y_positions, dtype=np.float64),
+                    num_drones, num_edge_servers, num_cloud_servers, indptr, both_dst)
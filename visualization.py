@@ -0,0 +1,67 @@
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from parameters import *
+
+
+def link_segments(topology, src, dst):  # 링크 목록을 LineCollection 용 (링크 수, 2, 2) 좌표 배열로 변환
+    return np.stack((np.column_stack((topology.x_positions[src], topology.y_positions[src])),
+                     np.column_stack((topology.x_positions[dst], topology.y_positions[dst]))), axis=1)
+
+
+def path_segments(topology, paths):  # 워크플로우 배치 경로들의 연속된 노드 쌍을 좌표 배열로 변환
+    segments = []
+    colors = []
+    color_map = plt.get_cmap("tab20")
+    for index, path in enumerate(paths):
+        path = np.asarray(path)
+        if len(path) < 2:
+            continue
+        segments.append(link_segments(topology, path[:-1], path[1:]))
+        colors.extend([color_map(index % color_map.N)] * (len(path) - 1))
+    if not segments:
+        return np.empty((0, 2, 2)), colors
+    return np.concatenate(segments), colors
+
+
+def render_result(topology, paths=(), output_path=None, show=True,
+                  monitoring_area=SizeOfMonitoringArea, edge_server_area=EdgeServerArea,
+                  cloud_server_area=CloudServerArea):
+    # 드론들의 배치 상황, 연결 상황, 선택된 워크플로우 배치 경로를 한 번에 그림
+    # output_path 를 지정하면 그림을 파일로 저장하고, show 가 True 이면 화면에 표시
+    if output_path is not None and not show:
+        matplotlib.use("Agg")
+    figure, axes = plt.subplots()
+    num_drones = topology.num_drones
+    num_servers = num_drones + topology.num_edge_servers
+
+    src, dst = topology.links()
+    d2d = dst <= num_drones  # 드론간 연결
+    e2c = src > num_drones  # 에지 서버와 클라우드 서버간 연결 (드론과 에지 서버간의 연결은 표시하지 않음)
+    axes.add_collection(LineCollection(link_segments(topology, src[d2d], dst[d2d]), colors="green", linewidths=0.5))
+    axes.add_collection(LineCollection(link_segments(topology, src[e2c], dst[e2c]), colors="black", linewidths=0.5))
+    segments, colors = path_segments(topology, paths)
+    if len(segments):
+        axes.add_collection(LineCollection(segments, colors=colors, linewidths=1.5))
+
+    x_positions = topology.x_positions
+    y_positions = topology.y_positions
+    axes.scatter(x_positions[1:num_drones + 1], y_positions[1:num_drones + 1], edgecolors="blue", s=30)
+    axes.scatter(x_positions[num_drones + 1:num_servers + 1], y_positions[num_drones + 1:num_servers + 1],
+                 edgecolors="black", s=80)
+    axes.scatter(x_positions[num_servers + 1:], y_positions[num_servers + 1:], edgecolors="red", s=150)
+    axes.fill_between([1, monitoring_area], [monitoring_area, monitoring_area], alpha=0.1)
+    axes.fill_between([monitoring_area, monitoring_area + edge_server_area],
+                      [monitoring_area, monitoring_area], alpha=0.2)
+    axes.fill_between([monitoring_area + edge_server_area, monitoring_area + edge_server_area + cloud_server_area],
+                      [monitoring_area, monitoring_area], alpha=0.1)
+    axes.autoscale_view()
+
+    if output_path is not None:
+        figure.savefig(output_path)
+    if show:
+        plt.show()
+    plt.close(figure)
+    return figure
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+class WorkflowTable:
+    # WorkflowInfo 를 (워크플로우 수, 최대 태스크 수) 배열로 평탄화한 테이블
+    # 배열의 w 번째 행은 WorkflowInfo[w + 1] 에 해당하며, 태스크가 없는 칸의 요구량은 0
+
+    def __init__(self, num_tasks, processing, bandwidth):
+        self.num_tasks = num_tasks
+        self.processing = processing
+        self.bandwidth = bandwidth
+        self.task_mask = np.arange(processing.shape[1])[None, :] < num_tasks[:, None]
+
+    @property
+    def num_workflows(self):
+        return self.processing.shape[0]
+
+    @property
+    def max_tasks(self):
+        return self.processing.shape[1]
+
+    def workflow(self, index):  # index 번째(0부터 시작) 워크플로우의 태스크별 요구량
+        num_of_task = self.num_tasks[index]
+        return self.processing[index, :num_of_task], self.bandwidth[index, :num_of_task]
+
+
+def flatten_workflows(temp_workflow_info):
+    # temp_workflow_info 는 WorkflowInfo 와 같이 0번 더미 항목을 포함한 리스트
+    workflows = temp_workflow_info[1:]
+    num_tasks = np.array([len(workflow) for workflow in workflows], dtype=np.int64)
+    max_tasks = int(num_tasks.max()) if len(num_tasks) else 0
+    processing = np.zeros((len(workflows), max_tasks), dtype=np.int64)
+    bandwidth = np.zeros((len(workflows), max_tasks), dtype=np.int64)
+    for index, workflow in enumerate(workflows):
+        for task, (_, required_processing_power, required_bandwidth) in enumerate(workflow):
+            processing[index, task] = required_processing_power
+            bandwidth[index, task] = required_bandwidth
+    return WorkflowTable(num_tasks, processing, bandwidth)